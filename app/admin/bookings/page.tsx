@@ -5,13 +5,19 @@ import { useRouter } from "next/navigation"
 import { AdminLayout } from "@/components/admin-layout"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
-import { fetchBookings } from "@/lib/api"
+import { Button } from "@/components/ui/button"
+import { Input } from "@/components/ui/input"
+import { fetchBookings, searchAdmin } from "@/lib/api"
 import type { Booking } from "@/lib/types"
 
 export default function AdminBookingsPage() {
   const router = useRouter()
   const [bookings, setBookings] = useState<Booking[]>([])
   const [loading, setLoading] = useState(true)
+  const [query, setQuery] = useState("")
+  const [total, setTotal] = useState<string | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     const token = localStorage.getItem("adminToken")
@@ -25,7 +31,8 @@ export default function AdminBookingsPage() {
   const loadBookings = async (token: string) => {
     try {
       const data = await fetchBookings(token)
-      setBookings(data)
+      setBookings(data.items)
+      setNextCursor(data.next_cursor)
     } catch (error) {
       console.error("[v0] Failed to load bookings:", error)
     } finally {
@@ -33,6 +40,40 @@ export default function AdminBookingsPage() {
     }
   }
 
+  const loadMore = async () => {
+    const token = localStorage.getItem("adminToken")
+    if (!token || !nextCursor) return
+    setLoadingMore(true)
+    try {
+      const data = await fetchBookings(token, nextCursor)
+      setBookings((current) => [...current, ...data.items])
+      setNextCursor(data.next_cursor)
+    } catch (error) {
+      console.error("[v0] Failed to load more bookings:", error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const handleSearch = async (e: React.FormEvent) => {
+    e.preventDefault()
+    const token = localStorage.getItem("adminToken")
+    if (!token) return
+    if (!query.trim()) {
+      setTotal(null)
+      loadBookings(token)
+      return
+    }
+    try {
+      const data = await searchAdmin(token, "bookings", { q: query.trim() })
+      setBookings(data.items)
+      setNextCursor(null)
+      setTotal(data.total_is_estimate ? `${data.total}+` : String(data.total))
+    } catch (error) {
+      console.error("[v0] Failed to search bookings:", error)
+    }
+  }
+
   const formatCurrency = (amount: number) => {
     return new Intl.NumberFormat("en-NG", {
       style: "currency",
@@ -68,8 +109,18 @@ export default function AdminBookingsPage() {
         </div>
 
         <Card className="border-none shadow-lg">
-          <CardHeader>
-            <CardTitle className="font-serif text-2xl">All Bookings</CardTitle>
+          <CardHeader className="space-y-4">
+            <CardTitle className="font-serif text-2xl">
+              {total === null ? "All Bookings" : `${total} matching bookings`}
+            </CardTitle>
+            <form onSubmit={handleSearch} className="flex gap-2">
+              <Input
+                value={query}
+                onChange={(e) => setQuery(e.target.value)}
+                placeholder="Search by name, email, phone, company or payment reference"
+              />
+              <Button type="submit">Search</Button>
+            </form>
           </CardHeader>
           <CardContent>
             <div className="overflow-x-auto">
@@ -135,6 +186,13 @@ export default function AdminBookingsPage() {
                 </tbody>
               </table>
             </div>
+            {nextCursor && (
+              <div className="flex justify-center pt-6">
+                <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? "Loading..." : "Load more"}
+                </Button>
+              </div>
+            )}
           </CardContent>
         </Card>
       </div>
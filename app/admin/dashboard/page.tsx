@@ -5,15 +5,16 @@ import { useRouter } from "next/navigation"
 import { AdminLayout } from "@/components/admin-layout"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Building2, Users, DollarSign, TrendingUp } from "lucide-react"
-import { fetchBookings, fetchTransactions } from "@/lib/api"
+import { fetchAdminStats } from "@/lib/api"
 
 export default function AdminDashboardPage() {
   const router = useRouter()
   const [stats, setStats] = useState({
     totalSpaces: 0,
+    availableSpaces: 0,
     totalBookings: 0,
     totalRevenue: 0,
-    pendingBookings: 0,
+    confirmedBookings: 0,
   })
   const [loading, setLoading] = useState(true)
 
@@ -28,16 +29,14 @@ export default function AdminDashboardPage() {
 
   const loadDashboardData = async (token: string) => {
     try {
-      const [bookings, transactions] = await Promise.all([fetchBookings(token), fetchTransactions(token)])
-
-      const totalRevenue = transactions.reduce((sum: number, t: any) => sum + t.amount, 0)
-      const pendingBookings = bookings.filter((b: any) => b.status === "pending").length
-
+      // Totals are maintained server-side, so they cover every booking and transaction
+      const data = await fetchAdminStats(token)
       setStats({
-        totalSpaces: 12, // This would come from spaces API
-        totalBookings: bookings.length,
-        totalRevenue,
-        pendingBookings,
+        totalSpaces: data.totalSpaces,
+        availableSpaces: data.availableSpaces,
+        totalBookings: data.totalBookings,
+        totalRevenue: data.totalRevenue,
+        confirmedBookings: data.confirmedBookings,
       })
     } catch (error) {
       console.error("[v0] Failed to load dashboard data:", error)
@@ -81,7 +80,7 @@ export default function AdminDashboardPage() {
             </CardHeader>
             <CardContent>
               <div className="text-3xl font-bold">{stats.totalSpaces}</div>
-              <p className="text-xs text-muted-foreground mt-1">Available for booking</p>
+              <p className="text-xs text-muted-foreground mt-1">{stats.availableSpaces} available for booking</p>
             </CardContent>
           </Card>
 
@@ -92,7 +91,7 @@ export default function AdminDashboardPage() {
             </CardHeader>
             <CardContent>
               <div className="text-3xl font-bold">{stats.totalBookings}</div>
-              <p className="text-xs text-muted-foreground mt-1">{stats.pendingBookings} pending approval</p>
+              <p className="text-xs text-muted-foreground mt-1">{stats.confirmedBookings} confirmed</p>
             </CardContent>
           </Card>
 
@@ -8,6 +8,7 @@ import { AdminLayout } from "@/components/admin-layout"
 import { Button } from "@/components/ui/button"
 import { Card, CardContent } from "@/components/ui/card"
 import { Upload } from "lucide-react"
+import { uploadMediaDirect } from "@/lib/api"
 
 export default function AdminMediaPage() {
   const router = useRouter()
@@ -29,9 +30,7 @@ export default function AdminMediaPage() {
       const token = localStorage.getItem("adminToken")
       if (!token) return
 
-      // Upload logic would go here
-      console.log("[v0] Uploading file:", file.name)
-      // const response = await uploadMedia(file, token)
+      await uploadMediaDirect(file, token)
     } catch (error) {
       console.error("[v0] Upload failed:", error)
     } finally {
@@ -5,6 +5,7 @@ import { useRouter } from "next/navigation"
 import { AdminLayout } from "@/components/admin-layout"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
+import { Button } from "@/components/ui/button"
 import { fetchTransactions } from "@/lib/api"
 import type { Transaction } from "@/lib/types"
 
@@ -12,6 +13,8 @@ export default function AdminTransactionsPage() {
   const router = useRouter()
   const [transactions, setTransactions] = useState<Transaction[]>([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     const token = localStorage.getItem("adminToken")
@@ -25,7 +28,8 @@ export default function AdminTransactionsPage() {
   const loadTransactions = async (token: string) => {
     try {
       const data = await fetchTransactions(token)
-      setTransactions(data)
+      setTransactions(data.items)
+      setNextCursor(data.next_cursor)
     } catch (error) {
       console.error("[v0] Failed to load transactions:", error)
     } finally {
@@ -33,6 +37,21 @@ export default function AdminTransactionsPage() {
     }
   }
 
+  const loadMore = async () => {
+    const token = localStorage.getItem("adminToken")
+    if (!token || !nextCursor) return
+    setLoadingMore(true)
+    try {
+      const data = await fetchTransactions(token, nextCursor)
+      setTransactions((current) => [...current, ...data.items])
+      setNextCursor(data.next_cursor)
+    } catch (error) {
+      console.error("[v0] Failed to load more transactions:", error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const formatCurrency = (amount: number) => {
     return new Intl.NumberFormat("en-NG", {
       style: "currency",
@@ -150,6 +169,13 @@ export default function AdminTransactionsPage() {
                 </tbody>
               </table>
             </div>
+            {nextCursor && (
+              <div className="flex justify-center pt-6">
+                <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? "Loading..." : "Load more"}
+                </Button>
+              </div>
+            )}
           </CardContent>
         </Card>
       </div>
@@ -4,6 +4,7 @@
 
 import { Navigation } from '@/components/navigation';
 import { Footer } from '@/components/footer';
+import { ResponsiveImage } from '@/components/responsive-image';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
@@ -79,9 +80,11 @@ export default function SpaceDetailPage() {
 
       {/* Hero Section */}
       <section className='relative h-[60vh] overflow-hidden'>
-        <img
+        <ResponsiveImage
           src={space.imageUrl || '/placeholder.svg'}
           alt={space.name}
+          image={space}
+          priority
           className='w-full h-full object-cover'
         />
         <div className='absolute inset-0 bg-gradient-to-t from-foreground/80 to-transparent' />
@@ -4,6 +4,7 @@
 
 import { Navigation } from '@/components/navigation';
 import { Footer } from '@/components/footer';
+import { ResponsiveImage } from '@/components/responsive-image';
 import { Card, CardContent } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
@@ -21,12 +22,12 @@ export default function SpacesPage() {
   >('all');
 
   useEffect(() => {
-    loadSpaces();
-  }, []);
+    loadSpaces(filter);
+  }, [filter]);
 
-  const loadSpaces = async () => {
+  const loadSpaces = async (type: typeof filter) => {
     try {
-      const data = await fetchSpaces();
+      const data = await fetchSpaces(type === 'all' ? undefined : { type });
       setSpaces(data);
     } catch (error) {
       console.error('[v0] Failed to load spaces:', error);
@@ -35,9 +36,6 @@ export default function SpacesPage() {
     }
   };
 
-  const filteredSpaces =
-    filter === 'all' ? spaces : spaces.filter((space) => space.type === filter);
-
   const formatPrice = (price: number) => {
     return new Intl.NumberFormat('en-NG', {
       style: 'currency',
@@ -129,7 +127,7 @@ export default function SpacesPage() {
               <div className='inline-block animate-spin rounded-full h-12 w-12 border-b-2 border-primary' />
               <p className='mt-4 text-muted-foreground'>Loading spaces...</p>
             </div>
-          ) : filteredSpaces.length === 0 ? (
+          ) : spaces.length === 0 ? (
             <div className='text-center py-16'>
               <p className='text-xl text-muted-foreground'>
                 No spaces available in this category.
@@ -137,18 +135,20 @@ export default function SpacesPage() {
             </div>
           ) : (
             <div className='grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8'>
-              {filteredSpaces.map((space) => (
+              {spaces.map((space) => (
                 <Card
                   key={space._id}
                   className='group overflow-hidden border-none shadow-lg hover:shadow-2xl transition-all hover:-translate-y-1 duration-300 bg-card'
                 >
                   <div className='relative aspect-[4/3] overflow-hidden'>
-                    <img
+                    <ResponsiveImage
                       src={
                         space.imageUrl ||
                         '/placeholder.svg?height=400&width=600&query=luxury office space'
                       }
                       alt={space.name}
+                      image={space}
+                      sizes='(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw'
                       className='w-full h-full object-cover group-hover:scale-110 transition-transform duration-500'
                     />
                     {space.available ? (
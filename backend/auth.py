@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from dotenv import load_dotenv
+
+from backend.cache import LRUCache
+
+load_dotenv()
+
+# bcrypt releases the GIL while hashing, so a thread pool sized to the
+# core count runs checks in parallel without blocking the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# Failed login throttling
+LOGIN_WINDOW_SECONDS = int(os.getenv("LOGIN_WINDOW_SECONDS", "900"))
+LOGIN_MAX_ATTEMPTS_PER_EMAIL = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_EMAIL", "5"))
+LOGIN_MAX_ATTEMPTS_PER_IP = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "20"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password with bcrypt on the password pool"""
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(
+        password_executor, bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt()
+    )
+    return hashed.decode("utf-8")
+
+
+async def check_password(password: str, hashed: str) -> bool:
+    """Check a password against a bcrypt hash on the password pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+    )
+
+
+class LoginThrottle:
+    """Sliding-window counter of failed attempts per key"""
+
+    def __init__(self, max_attempts: int, window_seconds: int = LOGIN_WINDOW_SECONDS):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self._failures = LRUCache(LOGIN_THROTTLE_MAX_KEYS)
+
+    def _recent(self, key: str) -> deque:
+        attempts = self._failures.get(key)
+        if attempts is None:
+            return deque()
+        cutoff = time.monotonic() - self.window_seconds
+        while attempts and attempts[0] <= cutoff:
+            attempts.popleft()
+        return attempts
+
+    def retry_after(self, key: str) -> int:
+        """Seconds until the key may try again, or 0 if it is not throttled"""
+        attempts = self._recent(key)
+        if len(attempts) < self.max_attempts:
+            return 0
+        return max(1, int(attempts[0] + self.window_seconds - time.monotonic()) + 1)
+
+    def record_failure(self, key: str):
+        attempts = self._recent(key)
+        attempts.append(time.monotonic())
+        self._failures.set(key, attempts)
+
+    def reset(self, key: str):
+        self._failures.set(key, deque())
+
+
+email_throttle = LoginThrottle(LOGIN_MAX_ATTEMPTS_PER_EMAIL)
+ip_throttle = LoginThrottle(LOGIN_MAX_ATTEMPTS_PER_IP)
+
+
+def client_ip(request) -> str:
+    """Client address, honouring X-Forwarded-For only when behind a trusted proxy"""
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
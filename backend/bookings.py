@@ -0,0 +1,91 @@
+import os
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from dotenv import load_dotenv
+
+from backend.database import get_spaces_collection
+
+load_dotenv()
+
+# How long a space stays reserved for a buyer who has started payment
+BOOKING_HOLD_MINUTES = int(os.getenv("BOOKING_HOLD_MINUTES", "15"))
+# Unpaid bookings are removed by a TTL index this long after creation,
+# leaving room for late payment confirmations after the hold lapses
+PENDING_BOOKING_TTL_HOURS = int(os.getenv("PENDING_BOOKING_TTL_HOURS", "24"))
+
+# Fields hold_space and confirm_space_hold add to spaces; hold_booking_id is a
+# payment reference, so they are kept out of public responses
+HOLD_FIELDS = ("hold_booking_id", "hold_expires_at", "booked_by")
+
+
+def hold_is_free(now: datetime):
+    """Filter matching spaces with no hold or an expired one"""
+    return {
+        "$or": [
+            {"hold_expires_at": {"$exists": False}},
+            {"hold_expires_at": None},
+            {"hold_expires_at": {"$lte": now}},
+        ]
+    }
+
+
+async def hold_space(space_id: str, booking_id: str, now: datetime):
+    """
+    Atomically reserve an available space for a booking
+
+    Args:
+        space_id: Space to reserve
+        booking_id: Booking that will own the hold
+        now: Current time, used for expiry checks
+
+    Returns:
+        dict: The held space, or None if it is unavailable or already held
+    """
+    spaces_collection = get_spaces_collection()
+    return await spaces_collection.find_one_and_update(
+        {"_id": ObjectId(space_id), "available": True, **hold_is_free(now)},
+        {
+            "$set": {
+                "hold_booking_id": booking_id,
+                "hold_expires_at": now + timedelta(minutes=BOOKING_HOLD_MINUTES),
+            }
+        },
+        projection={"name": 1, "price": 1, "hold_expires_at": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def release_space_hold(space_id: str, booking_id: str):
+    """Release a hold, but only if the given booking still owns it"""
+    spaces_collection = get_spaces_collection()
+    await spaces_collection.update_one(
+        {"_id": ObjectId(space_id), "hold_booking_id": booking_id},
+        {"$unset": {"hold_booking_id": "", "hold_expires_at": ""}},
+    )
+
+
+async def confirm_space_hold(space_id: str, booking_id: str, now: datetime):
+    """
+    Turn a booking's hold into a sale, marking the space unavailable
+
+    The space is taken if this booking still holds it, or if nobody else
+    holds it (the booking's own hold may have lapsed before payment landed).
+
+    Returns:
+        bool: True if the space was marked as sold to this booking
+    """
+    spaces_collection = get_spaces_collection()
+    result = await spaces_collection.update_one(
+        {
+            "_id": ObjectId(space_id),
+            "available": True,
+            "$or": [{"hold_booking_id": booking_id}, *hold_is_free(now)["$or"]],
+        },
+        {
+            "$set": {"available": False, "booked_by": booking_id, "updated_at": now},
+            "$unset": {"hold_booking_id": "", "hold_expires_at": ""},
+        },
+    )
+    return result.modified_count == 1
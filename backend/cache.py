@@ -0,0 +1,150 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from fastapi import Request, Response
+from dotenv import load_dotenv
+
+from backend.responses import dumps
+
+load_dotenv()
+
+# Response cache configuration
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))
+
+
+class CacheEntry:
+    """Serialized response body with its ETag and expiry time"""
+
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """In-process TTL cache with least-recently-used eviction"""
+
+    def __init__(self, ttl: int = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._dependents: Dict[str, Set[str]] = {}
+
+    def depends_on(self, prefix: str, *sources: str):
+        """Invalidate entries under `prefix` whenever one of the source prefixes is invalidated"""
+        for source in sources:
+            self._dependents.setdefault(source, set()).add(prefix)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, body: bytes) -> CacheEntry:
+        entry = CacheEntry(body, make_etag(body), time.monotonic() + self.ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, prefix: str = ""):
+        """Drop every entry whose key starts with the given route prefix"""
+        if not prefix:
+            self._entries.clear()
+            return
+        prefixes = (prefix, *self._dependents.get(prefix, ()))
+        for key in [key for key in self._entries if key.startswith(prefixes)]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used key"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def set(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def cache_key(request: Request) -> str:
+    """Key a request by route path and normalized query string"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+async def cached_json_response(request: Request, loader: Callable[[], Awaitable]) -> Response:
+    """
+    Serve a JSON payload from the response cache, loading it on a miss
+
+    Args:
+        request: Incoming request, used for the cache key and If-None-Match
+        loader: Coroutine function producing the payload (raw MongoDB documents are fine)
+
+    Returns:
+        Response: 200 with the cached body, or 304 when the client copy is current
+    """
+    key = cache_key(request)
+    entry = response_cache.get(key)
+    if entry is None:
+        payload = await loader()
+        body = dumps(payload)
+        entry = response_cache.set(key, body)
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={RESPONSE_CACHE_MAX_AGE}",
+    }
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
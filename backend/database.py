@@ -1,28 +1,102 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+from pymongo.read_preferences import SecondaryPreferred
 from pymongo.errors import ConnectionFailure
 import os
 from dotenv import load_dotenv
 
+from backend.metrics import MongoCommandMetrics
+
 load_dotenv()
 
+
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+@dataclass(frozen=True)
+class MongoSettings:
+    """MongoDB connection settings, read from the environment"""
+
+    url: str = "mongodb://localhost:27017"
+    database_name: str = "fombina_tower"
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: Optional[int] = None
+    server_selection_timeout_ms: int = 30000
+    connect_timeout_ms: int = 20000
+    compressors: List[str] = field(default_factory=list)
+    # Let read-only handlers that opt in be served by secondaries
+    read_from_secondaries: bool = False
+    max_staleness_seconds: Optional[int] = None
+
+    @classmethod
+    def from_env(cls):
+        compressors = os.getenv("MONGODB_COMPRESSORS", "")
+        return cls(
+            url=os.getenv("MONGODB_URL", cls.url),
+            database_name=os.getenv("DATABASE_NAME", cls.database_name),
+            max_pool_size=int(os.getenv("MONGODB_MAX_POOL_SIZE", str(cls.max_pool_size))),
+            min_pool_size=int(os.getenv("MONGODB_MIN_POOL_SIZE", str(cls.min_pool_size))),
+            max_idle_time_ms=_optional_int("MONGODB_MAX_IDLE_TIME_MS"),
+            server_selection_timeout_ms=int(
+                os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", str(cls.server_selection_timeout_ms))
+            ),
+            connect_timeout_ms=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", str(cls.connect_timeout_ms))),
+            compressors=[c.strip() for c in compressors.split(",") if c.strip()],
+            read_from_secondaries=os.getenv("MONGODB_READ_FROM_SECONDARIES", "false").lower() == "true",
+            max_staleness_seconds=_optional_int("MONGODB_MAX_STALENESS_SECONDS"),
+        )
+
+    def client_options(self) -> dict:
+        """Keyword arguments for AsyncIOMotorClient"""
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "event_listeners": [MongoCommandMetrics()],
+        }
+        if self.max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = self.max_idle_time_ms
+        if self.compressors:
+            options["compressors"] = self.compressors
+        return options
+
+    def read_only_preference(self):
+        """Read preference for handlers that tolerate slightly stale data"""
+        if not self.read_from_secondaries:
+            return ReadPreference.PRIMARY
+        if self.max_staleness_seconds is not None:
+            return SecondaryPreferred(max_staleness=self.max_staleness_seconds)
+        return ReadPreference.SECONDARY_PREFERRED
+
+
 # MongoDB Configuration
-MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-DATABASE_NAME = os.getenv("DATABASE_NAME", "fombina_tower")
+settings = MongoSettings.from_env()
+MONGODB_URL = settings.url
+DATABASE_NAME = settings.database_name
 
 # Global MongoDB client
 client: AsyncIOMotorClient = None
 database = None
+# Collections routed with the read-only preference, built on first use
+read_only_collections = {}
 
 
 async def connect_to_mongo():
     """Connect to MongoDB database"""
     global client, database
     try:
-        client = AsyncIOMotorClient(MONGODB_URL)
-        database = client[DATABASE_NAME]
+        client = AsyncIOMotorClient(settings.url, **settings.client_options())
+        database = client[settings.database_name]
+        read_only_collections.clear()
         # Test connection
         await client.admin.command("ping")
-        print(f"✅ Connected to MongoDB: {DATABASE_NAME}")
+        print(f"✅ Connected to MongoDB: {settings.database_name}")
     except ConnectionFailure as e:
         print(f"❌ Failed to connect to MongoDB: {e}")
         raise
@@ -41,30 +115,59 @@ def get_database():
     return database
 
 
+def get_collection(name: str, read_only: bool = False):
+    """
+    Get a collection, optionally routed for read-only use
+
+    Read-only collections use secondaryPreferred when
+    MONGODB_READ_FROM_SECONDARIES is enabled; everything else, including
+    all writes, stays on the primary.
+    """
+    if not read_only:
+        return database[name]
+    collection = read_only_collections.get(name)
+    if collection is None:
+        collection = database.get_collection(name, read_preference=settings.read_only_preference())
+        read_only_collections[name] = collection
+    return collection
+
+
 # Collection helpers
-def get_spaces_collection():
-    return database.spaces
+def get_spaces_collection(read_only: bool = False):
+    return get_collection("spaces", read_only)
 
 
-def get_bookings_collection():
-    return database.bookings
+def get_bookings_collection(read_only: bool = False):
+    return get_collection("bookings", read_only)
 
 
-def get_transactions_collection():
-    return database.transactions
+def get_transactions_collection(read_only: bool = False):
+    return get_collection("transactions", read_only)
 
 
-def get_gallery_collection():
-    return database.gallery
+def get_gallery_collection(read_only: bool = False):
+    return get_collection("gallery", read_only)
 
 
-def get_timeline_collection():
-    return database.timeline
+def get_timeline_collection(read_only: bool = False):
+    return get_collection("timeline", read_only)
 
 
-def get_messages_collection():
-    return database.messages
+def get_messages_collection(read_only: bool = False):
+    return get_collection("messages", read_only)
 
 
 def get_admins_collection():
     return database.admins
+
+
+def get_stats_collection():
+    return database.stats
+
+
+def get_outbox_collection():
+    return database.outbox
+
+
+def get_jobs_collection():
+    return database.jobs
@@ -0,0 +1,160 @@
+import csv
+import io
+import os
+import zlib
+from datetime import date, datetime, time
+from typing import AsyncIterator, Optional, Union
+
+from bson import ObjectId
+from dotenv import load_dotenv
+
+from backend.database import (
+    get_bookings_collection,
+    get_transactions_collection,
+    get_messages_collection,
+)
+from backend.responses import dumps
+
+load_dotenv()
+
+# Documents fetched per getMore and rows per yielded chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Exportable collections with their collection getter and columns, in output order
+EXPORTS = {
+    "bookings": (
+        get_bookings_collection,
+        ["_id", "created_at", "name", "email", "phone", "company_name", "space_id",
+         "amount", "status", "payment_status", "payment_reference", "space_conflict"],
+    ),
+    "transactions": (
+        get_transactions_collection,
+        ["_id", "created_at", "reference", "booking_id", "space_name", "amount", "status"],
+    ),
+    "messages": (
+        get_messages_collection,
+        ["_id", "created_at", "name", "email", "phone", "status", "message"],
+    ),
+}
+
+# Text starting with these is run as a formula by spreadsheet apps
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def csv_value(value) -> str:
+    """Render a document field as a CSV cell"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Public form input like "=HYPERLINK(...)" must open as text, not a live formula
+        return "'" + value
+    return str(value)
+
+
+def as_datetime(value: Union[date, datetime]) -> datetime:
+    """Treat a bare date as midnight UTC"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
+
+
+def export_query(date_from: Optional[Union[date, datetime]], date_to: Optional[Union[date, datetime]]) -> dict:
+    """Filter on created_at; date_from is inclusive and date_to exclusive"""
+    created_at = {}
+    if date_from is not None:
+        created_at["$gte"] = as_datetime(date_from)
+    if date_to is not None:
+        created_at["$lt"] = as_datetime(date_to)
+    return {"created_at": created_at} if created_at else {}
+
+
+async def iter_batches(collection, query: dict, fields) -> AsyncIterator[list]:
+    """Walk a cursor oldest first, yielding lists of at most EXPORT_BATCH_SIZE documents"""
+    cursor = (
+        collection.find(query, {field: 1 for field in fields})
+        .sort([("created_at", 1), ("_id", 1)])
+        .batch_size(EXPORT_BATCH_SIZE)
+    )
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def csv_chunks(batches: AsyncIterator[list], fields) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for batch in batches:
+        writer.writerows([csv_value(doc.get(field)) for field in fields] for doc in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only output for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def ndjson_chunks(batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(dumps(doc) + b"\n" for doc in batch)
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally into a single gzip member"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(
+    name: str,
+    export_format: str = "csv",
+    date_from: Optional[Union[date, datetime]] = None,
+    date_to: Optional[Union[date, datetime]] = None,
+    gzip: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a collection export without materializing it
+
+    Args:
+        name: Key of EXPORTS
+        export_format: "csv" or "ndjson"
+        date_from: Only include documents created at or after this time
+        date_to: Only include documents created before this time
+        gzip: Compress the output
+
+    Returns:
+        AsyncIterator[bytes]: Body chunks, one per cursor batch
+    """
+    get_collection, fields = EXPORTS[name]
+    # Exports can run for minutes, so keep them off the primary when secondaries are enabled
+    batches = iter_batches(get_collection(read_only=True), export_query(date_from, date_to), fields)
+    chunks = csv_chunks(batches, fields) if export_format == "csv" else ndjson_chunks(batches)
+    return gzip_chunks(chunks) if gzip else chunks
+
+
+def export_filename(name: str, export_format: str, gzip: bool) -> str:
+    extension = EXPORT_FORMATS[export_format][1]
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{extension}"
+    return filename + ".gz" if gzip else filename
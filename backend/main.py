@@ -1,13 +1,20 @@
-from fastapi import FastAPI, HTTPException, Depends, status, File, UploadFile
+from fastapi import FastAPI, HTTPException, Depends, status, File, UploadFile, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
-from datetime import datetime, timedelta
+from typing import Optional, List, Union
+from datetime import date, datetime, timedelta
+import asyncio
+import hashlib
+import json
 import os
 from dotenv import load_dotenv
 import jwt
 from bson import ObjectId
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from backend.database import (
     connect_to_mongo,
@@ -20,13 +27,43 @@ from backend.database import (
     get_messages_collection,
     get_admins_collection,
 )
-from backend.services.cloudinary_service import upload_image, delete_image
-from backend.services.email_service import send_booking_confirmation, send_contact_notification
-from backend.services.paystack_service import initialize_payment, verify_payment as verify_paystack_payment
+from backend.auth import check_password, client_ip, email_throttle, ip_throttle
+from backend.cache import cached_json_response, response_cache
+from backend.export import EXPORTS, EXPORT_FORMATS, export_filename, export_stream
+from backend.search import SEARCHES, search_collection
+from backend.metrics import MetricsMiddleware
+from backend.middleware import UploadSizeLimitMiddleware
+from backend.outbox import start_outbox_worker, stop_outbox_worker, outbox_metrics
+from backend.stats import increment_stats, read_stats
+from backend.bookings import HOLD_FIELDS, PENDING_BOOKING_TTL_HOURS, hold_space, release_space_hold
+from backend.payments import booking_id_from_reference, get_recorded_payment, record_successful_payment
+from backend.responses import BSONJSONResponse
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, paginate
+from backend.services.cloudinary_service import (
+    CLOUDINARY_MAX_CONCURRENT_UPLOADS,
+    IMAGE_FIELDS,
+    upload_image,
+    delete_image,
+    delete_images,
+    responsive_image,
+    public_id_from_url,
+    sign_upload,
+    verify_upload,
+    delivery_url,
+)
+from backend.services.email_service import send_contact_notification
+from backend.services.paystack_service import (
+    initialize_payment,
+    verify_payment as verify_paystack_payment,
+    start_paystack_client,
+    close_paystack_client,
+    verify_webhook_signature,
+    parse_charge_event,
+)
 
 load_dotenv()
 
-app = FastAPI(title="Fombina Tower API", version="1.0.0")
+app = FastAPI(title="Fombina Tower API", version="1.0.0", default_response_class=BSONJSONResponse)
 
 # CORS Configuration
 app.add_middleware(
@@ -42,15 +79,45 @@ security = HTTPBearer()
 
 # Environment Variables
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_SIZE_MB", "500")) * 1024 * 1024
+MAX_BULK_UPLOAD_BYTES = int(os.getenv("MAX_BULK_UPLOAD_SIZE_MB", "2048")) * 1024 * 1024
+MAX_BULK_UPLOAD_FILES = int(os.getenv("MAX_BULK_UPLOAD_FILES", "500"))
+# Uploads run on the Cloudinary thread pool, so more in flight would only queue there
+BULK_UPLOAD_CONCURRENCY = min(
+    int(os.getenv("BULK_UPLOAD_CONCURRENCY", str(CLOUDINARY_MAX_CONCURRENT_UPLOADS))),
+    CLOUDINARY_MAX_CONCURRENT_UPLOADS,
+)
+MEDIA_RESOURCE_TYPES = {"image", "video"}
+UPLOAD_HASH_CHUNK_SIZE = 1024 * 1024
+MAX_BULK_DELETE_ITEMS = int(os.getenv("MAX_BULK_DELETE_ITEMS", "1000"))
+
+# Cut off oversized media uploads while the body is still streaming in
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=MAX_UPLOAD_BYTES,
+    paths=["/api/admin/upload-media"],
+)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=MAX_BULK_UPLOAD_BYTES,
+    paths=["/api/admin/upload-media/bulk"],
+)
+
+# Outermost, so recorded latency covers every other middleware
+app.add_middleware(MetricsMiddleware, router_app=app)
 
 @app.on_event("startup")
 async def startup_event():
     await connect_to_mongo()
+    await start_paystack_client()
+    await start_outbox_worker()
     print("✅ Fombina Tower API started successfully")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await stop_outbox_worker()
+    await close_paystack_client()
     await close_mongo_connection()
     print("✅ Fombina Tower API shut down")
 
@@ -93,17 +160,31 @@ class MediaUpload(BaseModel):
     category: str
 
 
+class GalleryDelete(BaseModel):
+    ids: List[str]
+
+
+class DirectUploadResult(BaseModel):
+    """Fields of Cloudinary's upload response, forwarded by the browser"""
+    public_id: str
+    version: int
+    signature: str
+    format: str
+    resource_type: str = "image"
+    width: Optional[int] = None
+    height: Optional[int] = None
+    title: str = ""
+    category: str = "render"
+
+
 # Helper Functions
-def serialize_doc(doc):
-    """Convert MongoDB document to JSON-serializable dict"""
-    if doc is None:
-        return None
-    doc["_id"] = str(doc["_id"])
-    # Convert datetime objects to ISO format strings
-    for key, value in doc.items():
-        if isinstance(value, datetime):
-            doc[key] = value.isoformat()
-    return doc
+async def paginated_response(collection, cursor: Optional[str], limit: int):
+    """Fetch a keyset page and wrap it with the cursor for the next one"""
+    try:
+        docs, next_cursor = await paginate(collection, cursor=cursor, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BSONJSONResponse({"items": docs, "next_cursor": next_cursor})
 
 
 def create_jwt_token(data: dict):
@@ -133,24 +214,122 @@ def read_root():
     return {"message": "Fombina Tower API", "version": "1.0.0", "status": "running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics in text exposition format"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Spaces Endpoints
+async def space_image_fields(image_url: str):
+    """
+    Responsive image fields for a space's imageUrl
+
+    Reuses the variants stored when the image was uploaded to the gallery, and
+    builds them for other images in our Cloudinary account. Fields are None
+    for external images, so an update clears variants of a previous image.
+    """
+    media = await get_gallery_collection().find_one({"url": image_url}, {field: 1 for field in IMAGE_FIELDS})
+    if media and media.get("srcset"):
+        return {field: media.get(field) for field in IMAGE_FIELDS}
+
+    public_id = public_id_from_url(image_url)
+    if public_id:
+        return await responsive_image(public_id)
+    return {field: None for field in IMAGE_FIELDS}
+
+
+SPACE_SORT_FIELDS = {"name", "floor", "size", "price", "created_at"}
+
+# Public space responses leave out the booking hold bookkeeping
+PUBLIC_SPACE_PROJECTION = {field: 0 for field in HOLD_FIELDS}
+
+
+def build_range_filter(minimum: Optional[int], maximum: Optional[int]):
+    """Build a MongoDB range condition from optional inclusive bounds"""
+    condition = {}
+    if minimum is not None:
+        condition["$gte"] = minimum
+    if maximum is not None:
+        condition["$lte"] = maximum
+    return condition
+
+
 @app.get("/api/spaces")
-async def get_spaces():
-    """Get all available spaces"""
-    spaces_collection = get_spaces_collection()
-    spaces = await spaces_collection.find().to_list(length=100)
-    return [serialize_doc(space) for space in spaces]
+async def get_spaces(
+    request: Request,
+    space_type: Optional[str] = Query(None, alias="type"),
+    available: Optional[bool] = None,
+    min_floor: Optional[int] = None,
+    max_floor: Optional[int] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    q: Optional[str] = None,
+    sort: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Get spaces with optional filtering, sorting and full-text search
+
+    `sort` takes a field name, prefixed with `-` for descending order.
+    With `q` and no explicit sort, results are ordered by relevance.
+    """
+    spaces_collection = get_spaces_collection(read_only=True)
+
+    query = {}
+    if space_type:
+        query["type"] = space_type
+    if available is not None:
+        query["available"] = available
+    for field, minimum, maximum in (
+        ("floor", min_floor, max_floor),
+        ("price", min_price, max_price),
+        ("size", min_size, max_size),
+    ):
+        condition = build_range_filter(minimum, maximum)
+        if condition:
+            query[field] = condition
+    if q:
+        query["$text"] = {"$search": q}
+
+    projection = dict(PUBLIC_SPACE_PROJECTION)
+    if q:
+        projection["score"] = {"$meta": "textScore"}
+    if sort:
+        field = sort.lstrip("-")
+        if field not in SPACE_SORT_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Cannot sort by '{field}'")
+        sort_spec = [(field, -1 if sort.startswith("-") else 1), ("_id", 1)]
+    elif q:
+        sort_spec = [("score", {"$meta": "textScore"})]
+    else:
+        sort_spec = [("_id", 1)]
+
+    async def load_spaces():
+        spaces = await (
+            spaces_collection.find(query, projection)
+            .sort(sort_spec)
+            .skip(skip)
+            .limit(limit)
+            .to_list(length=limit)
+        )
+        return spaces
+
+    return await cached_json_response(request, load_spaces)
 
 
 @app.get("/api/spaces/{space_id}")
 async def get_space(space_id: str):
     """Get single space by ID"""
     try:
-        spaces_collection = get_spaces_collection()
-        space = await spaces_collection.find_one({"_id": ObjectId(space_id)})
+        spaces_collection = get_spaces_collection(read_only=True)
+        space = await spaces_collection.find_one({"_id": ObjectId(space_id)}, PUBLIC_SPACE_PROJECTION)
         if not space:
             raise HTTPException(status_code=404, detail="Space not found")
-        return serialize_doc(space)
+        return BSONJSONResponse(space)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -160,10 +339,13 @@ async def create_space(space: Space, token: dict = Depends(verify_jwt_token)):
     """Create new space (Admin only)"""
     spaces_collection = get_spaces_collection()
     space_dict = space.dict()
+    space_dict.update(await space_image_fields(space.imageUrl))
     space_dict["created_at"] = datetime.utcnow()
     result = await spaces_collection.insert_one(space_dict)
-    space_dict["_id"] = str(result.inserted_id)
-    return serialize_doc(space_dict)
+    await increment_stats(total_spaces=1, available_spaces=int(space.available))
+    response_cache.invalidate("/api/spaces")
+    space_dict["_id"] = result.inserted_id
+    return BSONJSONResponse(space_dict)
 
 
 @app.put("/api/spaces/{space_id}")
@@ -172,15 +354,21 @@ async def update_space(space_id: str, space: Space, token: dict = Depends(verify
     try:
         spaces_collection = get_spaces_collection()
         space_dict = space.dict()
+        space_dict.update(await space_image_fields(space.imageUrl))
         space_dict["updated_at"] = datetime.utcnow()
         
-        result = await spaces_collection.update_one(
-            {"_id": ObjectId(space_id)}, {"$set": space_dict}
+        previous = await spaces_collection.find_one_and_update(
+            {"_id": ObjectId(space_id)},
+            {"$set": space_dict},
+            projection={"available": 1},
+            return_document=ReturnDocument.BEFORE,
         )
-        
-        if result.matched_count == 0:
+
+        if previous is None:
             raise HTTPException(status_code=404, detail="Space not found")
-        
+
+        await increment_stats(available_spaces=int(space.available) - int(bool(previous.get("available"))))
+        response_cache.invalidate("/api/spaces")
         return {"success": True, "message": "Space updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -189,24 +377,32 @@ async def update_space(space_id: str, space: Space, token: dict = Depends(verify
 # Booking Endpoints
 @app.post("/api/book-space")
 async def book_space(booking: BookingCreate):
-    """Create booking and generate Paystack payment URL"""
+    """Reserve a space and generate Paystack payment URL"""
+    space = None
     try:
         spaces_collection = get_spaces_collection()
         bookings_collection = get_bookings_collection()
-        
-        # Get space details
-        space = await spaces_collection.find_one({"_id": ObjectId(booking.spaceId)})
-        if not space:
-            raise HTTPException(status_code=404, detail="Space not found")
 
-        if not space.get("available"):
-            raise HTTPException(status_code=400, detail="Space is not available")
+        now = datetime.utcnow()
+        booking_oid = ObjectId()
+        booking_id = str(booking_oid)
+
+        # Atomically place a hold on the space so concurrent buyers cannot pay for it too
+        space = await hold_space(booking.spaceId, booking_id, now)
+        if not space:
+            existing = await spaces_collection.find_one({"_id": ObjectId(booking.spaceId)}, {"available": 1})
+            if not existing:
+                raise HTTPException(status_code=404, detail="Space not found")
+            if not existing.get("available"):
+                raise HTTPException(status_code=400, detail="Space is not available")
+            raise HTTPException(status_code=409, detail="Space is currently reserved by another buyer")
 
         # Calculate deposit (10% of monthly price)
         deposit_amount = int(space["price"] * 0.1)
 
-        # Create booking record
+        # Create booking record; unpaid bookings are expired by a TTL index
         booking_data = {
+            "_id": booking_oid,
             "space_id": booking.spaceId,
             "name": booking.userName,
             "email": booking.userEmail,
@@ -215,11 +411,11 @@ async def book_space(booking: BookingCreate):
             "status": "pending",
             "payment_status": "pending",
             "amount": deposit_amount,
-            "created_at": datetime.utcnow(),
+            "created_at": now,
+            "expires_at": now + timedelta(hours=PENDING_BOOKING_TTL_HOURS),
         }
 
-        result = await bookings_collection.insert_one(booking_data)
-        booking_id = str(result.inserted_id)
+        await bookings_collection.insert_one(booking_data)
 
         # Generate Paystack payment URL
         payment_result = await initialize_payment(
@@ -238,11 +434,18 @@ async def book_space(booking: BookingCreate):
                 "bookingId": booking_id,
                 "paymentUrl": payment_result["authorization_url"],
                 "reference": payment_result["reference"],
+                "holdExpiresAt": space["hold_expires_at"].isoformat(),
             }
         else:
             raise HTTPException(status_code=400, detail=payment_result.get("error", "Payment initialization failed"))
 
     except Exception as e:
+        if space:
+            # Give the space back immediately rather than waiting for the hold to lapse
+            await release_space_hold(booking.spaceId, booking_id)
+            await get_bookings_collection().delete_one({"_id": booking_oid})
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -250,86 +453,124 @@ async def book_space(booking: BookingCreate):
 async def verify_payment(reference: str):
     """Verify Paystack payment and update booking"""
     try:
-        bookings_collection = get_bookings_collection()
-        transactions_collection = get_transactions_collection()
-        spaces_collection = get_spaces_collection()
-        
+        # Payments already recorded (e.g. by the webhook) are served from MongoDB
+        recorded = await get_recorded_payment(reference)
+        if recorded:
+            return recorded
+
         # Verify payment with Paystack
         verification = await verify_paystack_payment(reference)
 
         if not verification["success"]:
             raise HTTPException(status_code=400, detail=verification.get("error", "Payment verification failed"))
 
-        # Extract booking ID from reference
-        booking_id = reference.replace("FT-", "")
-
-        # Update booking status
-        await bookings_collection.update_one(
-            {"_id": ObjectId(booking_id)},
-            {
-                "$set": {
-                    "payment_status": "completed",
-                    "status": "confirmed",
-                    "payment_reference": reference,
-                    "updated_at": datetime.utcnow(),
-                }
-            },
-        )
-
-        # Create transaction record
-        transaction_data = {
-            "booking_id": booking_id,
-            "reference": reference,
-            "amount": verification["amount"] / 100,  # Convert from kobo
-            "status": "success",
-            "paystack_data": verification,
-            "created_at": datetime.utcnow(),
-        }
-        await transactions_collection.insert_one(transaction_data)
-
-        # Get booking and space details
-        booking = await bookings_collection.find_one({"_id": ObjectId(booking_id)})
-        space = await spaces_collection.find_one({"_id": ObjectId(booking["space_id"])})
-
-        # Send confirmation email
-        await send_booking_confirmation(
-            {
-                "name": booking["name"],
-                "email": booking["email"],
-                "phone": booking["phone"],
-                "space_name": space["name"],
-                "booking_id": booking_id,
-                "amount": verification["amount"] / 100,
-            }
-        )
-
-        return {
-            "success": True,
-            "reference": reference,
-            "spaceName": space["name"],
-            "amount": verification["amount"] / 100,
-        }
+        return await record_successful_payment(reference, verification)
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/paystack/webhook")
+async def paystack_webhook(request: Request):
+    """Receive Paystack events and confirm successful charges"""
+    body = await request.body()
+    if not verify_webhook_signature(body, request.headers.get("x-paystack-signature")):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    try:
+        event = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payload")
+
+    verification = parse_charge_event(event)
+    if not verification["success"]:
+        # Acknowledge events we do not act on so Paystack stops retrying them
+        return {"received": True, "processed": False}
+
+    reference = verification["reference"]
+    if not ObjectId.is_valid(booking_id_from_reference(reference)):
+        return {"received": True, "processed": False}
+
+    # Errors propagate as 500 so Paystack retries the delivery
+    await record_successful_payment(reference, verification)
+    return {"received": True, "processed": True}
+
+
 # Gallery Endpoints
 @app.get("/api/gallery")
-async def get_gallery():
+async def get_gallery(request: Request):
     """Get all gallery items"""
-    gallery_collection = get_gallery_collection()
-    media = await gallery_collection.find().sort("created_at", -1).to_list(length=100)
-    return [serialize_doc(item) for item in media]
+    gallery_collection = get_gallery_collection(read_only=True)
+
+    async def load_gallery():
+        media = await gallery_collection.find().sort("created_at", -1).to_list(length=100)
+        return media
+
+    return await cached_json_response(request, load_gallery)
 
 
 # Timeline Endpoints
 @app.get("/api/timeline")
-async def get_timeline():
+async def get_timeline(request: Request):
     """Get construction timeline"""
-    timeline_collection = get_timeline_collection()
-    events = await timeline_collection.find().sort("date", 1).to_list(length=100)
-    return [serialize_doc(event) for event in events]
+    timeline_collection = get_timeline_collection(read_only=True)
+
+    async def load_timeline():
+        events = await timeline_collection.find().sort("date", 1).to_list(length=100)
+        return events
+
+    return await cached_json_response(request, load_timeline)
+
+
+# Bundle Endpoints
+HOME_SPACE_FIELDS = ["name", "type", "floor", "size", "price", "available", "imageUrl", *IMAGE_FIELDS]
+HOME_GALLERY_FIELDS = ["title", "type", "url", "category", *IMAGE_FIELDS]
+HOME_TIMELINE_FIELDS = ["title", "description", "date", "status", "imageUrl"]
+
+response_cache.depends_on("/api/bundle/home", "/api/spaces", "/api/gallery", "/api/timeline")
+
+
+@app.get("/api/bundle/home")
+async def get_home_bundle(
+    request: Request,
+    spaces_limit: int = Query(6, ge=0, le=100),
+    gallery_limit: int = Query(12, ge=0, le=100),
+    timeline_limit: int = Query(20, ge=0, le=100),
+):
+    """
+    Available spaces, latest gallery items and the construction timeline in one response
+
+    The three queries run concurrently, each projected to the fields the
+    homepage renders. The payload is cached and ETagged like the individual
+    endpoints, and invalidated along with them.
+    """
+    spaces_collection = get_spaces_collection(read_only=True)
+    gallery_collection = get_gallery_collection(read_only=True)
+    timeline_collection = get_timeline_collection(read_only=True)
+
+    async def load_section(cursor, limit: int):
+        if not limit:
+            return []
+        return await cursor.limit(limit).to_list(length=limit)
+
+    async def load_bundle():
+        spaces, gallery, timeline = await asyncio.gather(
+            load_section(
+                spaces_collection.find({"available": True}, HOME_SPACE_FIELDS).sort("_id", 1),
+                spaces_limit,
+            ),
+            load_section(
+                gallery_collection.find({}, HOME_GALLERY_FIELDS).sort("created_at", -1),
+                gallery_limit,
+            ),
+            load_section(
+                timeline_collection.find({}, HOME_TIMELINE_FIELDS).sort("date", 1),
+                timeline_limit,
+            ),
+        )
+        return {"spaces": spaces, "gallery": gallery, "timeline": timeline}
+
+    return await cached_json_response(request, load_bundle)
 
 
 # Contact Endpoints
@@ -344,8 +585,9 @@ async def submit_contact(contact: ContactMessage):
         contact_data["status"] = "new"
 
         await messages_collection.insert_one(contact_data)
+        await increment_stats(unread_messages=1)
 
-        # Send notification to admin
+        # Queue notification to admin
         await send_contact_notification(contact_data)
 
         return {"success": True, "message": "Contact form submitted successfully"}
@@ -355,40 +597,113 @@ async def submit_contact(contact: ContactMessage):
 
 
 # Admin Endpoints
+def throttled(request_ip: str, email: str):
+    """Raise 429 if the client IP or target email has too many recent failed logins"""
+    retry_after = max(ip_throttle.retry_after(request_ip), email_throttle.retry_after(email))
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many failed login attempts. Try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 @app.post("/api/admin/login")
-async def admin_login(credentials: AdminLogin):
+async def admin_login(credentials: AdminLogin, request: Request):
     """Admin login"""
-    import bcrypt
-    
+    request_ip = client_ip(request)
+    email = credentials.email.lower()
+    throttled(request_ip, email)
+
     admins_collection = get_admins_collection()
     admin = await admins_collection.find_one({"email": credentials.email})
 
-    if not admin:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    # Verify password with bcrypt
-    if not bcrypt.checkpw(credentials.password.encode("utf-8"), admin["password"].encode("utf-8")):
+    # Verify password with bcrypt off the event loop
+    if not admin or not await check_password(credentials.password, admin["password"]):
+        ip_throttle.record_failure(request_ip)
+        email_throttle.record_failure(email)
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    email_throttle.reset(email)
     token = create_jwt_token({"email": credentials.email, "role": "admin"})
 
     return {"token": token, "email": credentials.email, "name": admin.get("name", "Admin")}
 
 
 @app.get("/api/admin/bookings")
-async def get_admin_bookings(token: dict = Depends(verify_jwt_token)):
-    """Get all bookings (Admin only)"""
-    bookings_collection = get_bookings_collection()
-    bookings = await bookings_collection.find().sort("created_at", -1).to_list(length=1000)
-    return [serialize_doc(booking) for booking in bookings]
+async def get_admin_bookings(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    token: dict = Depends(verify_jwt_token),
+):
+    """Get bookings, newest first, one page at a time (Admin only)"""
+    bookings_collection = get_bookings_collection(read_only=True)
+    return await paginated_response(bookings_collection, cursor, limit)
 
 
 @app.get("/api/admin/transactions")
-async def get_admin_transactions(token: dict = Depends(verify_jwt_token)):
-    """Get all transactions (Admin only)"""
-    transactions_collection = get_transactions_collection()
-    transactions = await transactions_collection.find().sort("created_at", -1).to_list(length=1000)
-    return [serialize_doc(transaction) for transaction in transactions]
+async def get_admin_transactions(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    token: dict = Depends(verify_jwt_token),
+):
+    """Get transactions, newest first, one page at a time (Admin only)"""
+    transactions_collection = get_transactions_collection(read_only=True)
+    return await paginated_response(transactions_collection, cursor, limit)
+
+
+async def hash_upload(file: UploadFile) -> str:
+    """SHA-256 of an uploaded file, read in chunks from its spooled temp file"""
+    digest = hashlib.sha256()
+    await file.seek(0)
+    while True:
+        chunk = await file.read(UPLOAD_HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+async def find_media_by_hash(hashes: List[str]):
+    """Existing gallery documents for the given content hashes, keyed by hash"""
+    gallery_collection = get_gallery_collection()
+    media = await gallery_collection.find(
+        {"sha256": {"$in": hashes}},
+        {"sha256": 1, "url": 1, "public_id": 1},
+    ).to_list(length=len(hashes))
+    return {item["sha256"]: item for item in media}
+
+
+async def upload_media_file(file: UploadFile):
+    """Stream one uploaded file to Cloudinary and return the result with its media type"""
+    resource_type = "image" if (file.content_type or "").startswith("image") else "video"
+
+    # Hand the spooled temp file to the SDK; anything over CLOUDINARY_CHUNK_SIZE is sent in chunks
+    await file.seek(0)
+    result = await upload_image(file.file, folder="fombina-tower", public_id=None, resource_type=resource_type)
+    result["type"] = resource_type
+    return result
+
+
+def build_media_document(file: UploadFile, result: dict, title: str, category: str, sha256: str):
+    """Build the gallery document for a successfully uploaded file"""
+    document = {
+        "title": title or file.filename,
+        "type": result["type"],
+        "url": result["url"],
+        "public_id": result["public_id"],
+        "sha256": sha256,
+        "category": category,
+        "created_at": datetime.utcnow(),
+    }
+    document.update({field: result[field] for field in IMAGE_FIELDS if field in result})
+    return document
+
+
+async def discard_duplicate_upload(result: dict):
+    """Remove an asset that lost a race with a concurrent upload of the same file"""
+    await delete_image(result["public_id"], resource_type=result["type"])
 
 
 @app.post("/api/admin/upload-media")
@@ -398,70 +713,303 @@ async def upload_media(
     category: str = "render",
     token: dict = Depends(verify_jwt_token),
 ):
-    """Upload media to Cloudinary (Admin only)"""
+    """
+    Upload media to Cloudinary (Admin only)
+
+    Files already in the gallery (same SHA-256) are not uploaded again; the
+    existing URL and public_id are returned with `duplicate: true`.
+    """
     try:
         gallery_collection = get_gallery_collection()
-        
-        # Read file data
-        file_data = await file.read()
+
+        sha256 = await hash_upload(file)
+        existing = (await find_media_by_hash([sha256])).get(sha256)
+        if existing:
+            return {"success": True, "url": existing["url"], "public_id": existing["public_id"], "duplicate": True}
 
         # Upload to Cloudinary
-        result = await upload_image(file_data, folder="fombina-tower", public_id=None)
+        result = await upload_media_file(file)
 
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result.get("error", "Upload failed"))
 
         # Save to database
-        media_data = {
-            "title": title or file.filename,
-            "type": "image" if file.content_type.startswith("image") else "video",
-            "url": result["url"],
-            "public_id": result["public_id"],
-            "category": category,
-            "created_at": datetime.utcnow(),
-        }
+        media_data = build_media_document(file, result, title, category, sha256)
 
-        await gallery_collection.insert_one(media_data)
+        try:
+            await gallery_collection.insert_one(media_data)
+        except DuplicateKeyError:
+            await discard_duplicate_upload(result)
+            existing = (await find_media_by_hash([sha256]))[sha256]
+            return {"success": True, "url": existing["url"], "public_id": existing["public_id"], "duplicate": True}
+        response_cache.invalidate("/api/gallery")
 
-        return {"success": True, "url": result["url"], "public_id": result["public_id"]}
+        return {"success": True, "url": result["url"], "public_id": result["public_id"], "duplicate": False}
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/admin/upload-media/bulk")
+async def upload_media_bulk(
+    files: List[UploadFile] = File(...),
+    category: str = "render",
+    token: dict = Depends(verify_jwt_token),
+):
+    """
+    Upload many media files concurrently (Admin only)
+
+    Files are sent to Cloudinary in parallel, capped at BULK_UPLOAD_CONCURRENCY,
+    and all successful uploads are recorded with a single insert_many.
+    Files already in the gallery, or repeated within the request, are matched
+    by SHA-256 and uploaded at most once.
+    Each file gets its own result, so partial failures are reported per file.
+    """
+    if len(files) > MAX_BULK_UPLOAD_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_UPLOAD_FILES} files per request")
+
+    gallery_collection = get_gallery_collection()
+    semaphore = asyncio.Semaphore(BULK_UPLOAD_CONCURRENCY)
+
+    hashes = await asyncio.gather(*(hash_upload(file) for file in files))
+    existing = await find_media_by_hash(list(set(hashes)))
+
+    # The first file with each new hash is uploaded; the rest reuse its result
+    first_index = {}
+    for index, sha256 in enumerate(hashes):
+        if sha256 not in existing:
+            first_index.setdefault(sha256, index)
+
+    async def upload_one(file: UploadFile):
+        async with semaphore:
+            try:
+                return await upload_media_file(file)
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+
+    uploads = dict(zip(
+        first_index,
+        await asyncio.gather(*(upload_one(files[index]) for index in first_index.values())),
+    ))
+
+    media_documents = [
+        build_media_document(files[index], uploads[sha256], "", category, sha256)
+        for sha256, index in first_index.items()
+        if uploads[sha256]["success"]
+    ]
+    if media_documents:
+        try:
+            await gallery_collection.insert_many(media_documents, ordered=False)
+        except BulkWriteError as e:
+            # Files a concurrent request recorded first: keep theirs, drop our copies
+            lost = [media_documents[error["index"]] for error in e.details["writeErrors"] if error["code"] == 11000]
+            if len(lost) < len(e.details["writeErrors"]):
+                raise
+            lost_hashes = [document["sha256"] for document in lost]
+            existing.update(await find_media_by_hash(lost_hashes))
+            await asyncio.gather(*(discard_duplicate_upload(uploads[sha256]) for sha256 in lost_hashes))
+        response_cache.invalidate("/api/gallery")
+
+    items = []
+    uploaded = duplicates = 0
+    for index, (file, sha256) in enumerate(zip(files, hashes)):
+        if sha256 in existing:
+            result, duplicate = existing[sha256], True
+        else:
+            result, duplicate = uploads[sha256], first_index[sha256] != index
+            if not result["success"]:
+                items.append({"filename": file.filename, "success": False, "error": result.get("error", "Upload failed")})
+                continue
+        if duplicate:
+            duplicates += 1
+        else:
+            uploaded += 1
+        items.append({"filename": file.filename, "success": True, "url": result["url"], "public_id": result["public_id"], "duplicate": duplicate})
+
+    return {"uploaded": uploaded, "duplicates": duplicates, "failed": len(files) - uploaded - duplicates, "results": items}
+
+
+@app.post("/api/admin/upload-media/sign")
+async def sign_media_upload(resource_type: str = "image", token: dict = Depends(verify_jwt_token)):
+    """
+    Issue signed parameters for uploading one file straight to Cloudinary (Admin only)
+
+    The browser posts the file with these fields to `upload_url`, in chunks for
+    large videos, then reports the result to /api/admin/upload-media/complete.
+    """
+    if resource_type not in MEDIA_RESOURCE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported resource type '{resource_type}'")
+    return sign_upload(resource_type, folder="fombina-tower")
+
+
+@app.post("/api/admin/upload-media/complete")
+async def complete_media_upload(upload: DirectUploadResult, token: dict = Depends(verify_jwt_token)):
+    """Verify a direct Cloudinary upload and record it in the gallery (Admin only)"""
+    if upload.resource_type not in MEDIA_RESOURCE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported resource type '{upload.resource_type}'")
+    if not verify_upload(upload.public_id, upload.version, upload.signature, folder="fombina-tower"):
+        raise HTTPException(status_code=400, detail="Invalid upload signature")
+
+    media_data = {
+        "title": upload.title or upload.public_id.rsplit("/", 1)[-1],
+        "type": upload.resource_type,
+        "url": delivery_url(upload.public_id, upload.version, upload.format, upload.resource_type),
+        "public_id": upload.public_id,
+        "category": upload.category,
+        "created_at": datetime.utcnow(),
+    }
+    if upload.resource_type == "image":
+        media_data.update(await responsive_image(upload.public_id, upload.width, upload.height))
+
+    # Recording the same upload twice (e.g. a retried request) keeps the first document
+    media = await get_gallery_collection().find_one_and_update(
+        {"public_id": upload.public_id},
+        {"$setOnInsert": media_data},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    response_cache.invalidate("/api/gallery")
+    return {"success": True, "url": media["url"], "public_id": media["public_id"]}
+
+
+@app.post("/api/admin/gallery/delete")
+async def delete_gallery_items(request_body: GalleryDelete, token: dict = Depends(verify_jwt_token)):
+    """
+    Delete many gallery items and their Cloudinary assets (Admin only)
+
+    Assets are removed up to 100 per Cloudinary call and the documents with a
+    single delete_many. Items whose asset could not be deleted are kept so the
+    request can be retried, and each ID gets its own result.
+    """
+    ids = list(dict.fromkeys(request_body.ids))
+    if len(ids) > MAX_BULK_DELETE_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_DELETE_ITEMS} items per request")
+
+    gallery_collection = get_gallery_collection()
+    object_ids = [ObjectId(item_id) for item_id in ids if ObjectId.is_valid(item_id)]
+    media = await gallery_collection.find(
+        {"_id": {"$in": object_ids}},
+        {"public_id": 1, "type": 1},
+    ).to_list(length=len(object_ids))
+    media_by_id = {str(item["_id"]): item for item in media}
+
+    # The Admin API deletes one resource type per call
+    public_ids = {}
+    for item in media:
+        if item.get("public_id"):
+            public_ids.setdefault(item.get("type") or "image", []).append(item["public_id"])
+    outcomes = {}
+    for result in await asyncio.gather(*(
+        delete_images(resource_public_ids, resource_type)
+        for resource_type, resource_public_ids in public_ids.items()
+    )):
+        outcomes.update(result)
+
+    removable = []
+    items = []
+    for item_id in ids:
+        item = media_by_id.get(item_id)
+        if item is None:
+            items.append({"id": item_id, "success": False, "error": "Gallery item not found"})
+            continue
+        # Assets already gone from Cloudinary ("not_found") are removed from the gallery too
+        outcome = outcomes.get(item.get("public_id"), {"success": True})
+        if outcome["success"]:
+            removable.append(item["_id"])
+            items.append({"id": item_id, "success": True})
+        else:
+            items.append({"id": item_id, "success": False, "error": outcome["error"]})
+
+    if removable:
+        await gallery_collection.delete_many({"_id": {"$in": removable}})
+        response_cache.invalidate("/api/gallery")
+
+    return {"deleted": len(removable), "failed": len(ids) - len(removable), "results": items}
+
+
 @app.get("/api/admin/contacts")
-async def get_admin_contacts(token: dict = Depends(verify_jwt_token)):
-    """Get all contact messages (Admin only)"""
-    messages_collection = get_messages_collection()
-    contacts = await messages_collection.find().sort("created_at", -1).to_list(length=1000)
-    return [serialize_doc(contact) for contact in contacts]
+async def get_admin_contacts(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    token: dict = Depends(verify_jwt_token),
+):
+    """Get contact messages, newest first, one page at a time (Admin only)"""
+    messages_collection = get_messages_collection(read_only=True)
+    return await paginated_response(messages_collection, cursor, limit)
+
+
+@app.get("/api/admin/search/{collection}")
+async def search_admin(
+    collection: str,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    token: dict = Depends(verify_jwt_token),
+):
+    """
+    Search bookings or messages (Admin only)
+
+    Emails, phone numbers and payment references are matched by prefix,
+    newest first; other text is matched against names, companies and
+    message bodies, most relevant first.
+    """
+    if collection not in SEARCHES:
+        raise HTTPException(status_code=404, detail=f"Cannot search '{collection}'")
+    if status and status not in SEARCHES[collection][2]:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{status}'")
+
+    return BSONJSONResponse(await search_collection(collection, q, status, skip, limit))
+
+
+@app.get("/api/admin/export/{collection}")
+async def export_collection(
+    collection: str,
+    export_format: str = Query("csv", alias="format"),
+    date_from: Optional[Union[datetime, date]] = Query(None, alias="from"),
+    date_to: Optional[Union[datetime, date]] = Query(None, alias="to"),
+    gzip: bool = False,
+    token: dict = Depends(verify_jwt_token),
+):
+    """
+    Stream bookings, transactions or messages as CSV or NDJSON (Admin only)
+
+    Rows are ordered oldest first and filtered on created_at in [from, to),
+    where from/to are ISO dates or datetimes (bare dates are midnight UTC).
+    With gzip=true the download is a .gz file.
+    """
+    if collection not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Cannot export '{collection}'")
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format '{export_format}'")
+
+    media_type = "application/gzip" if gzip else EXPORT_FORMATS[export_format][0]
+    filename = export_filename(collection, export_format, gzip)
+    return StreamingResponse(
+        export_stream(collection, export_format, date_from, date_to, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/api/admin/outbox")
+async def get_admin_outbox(token: dict = Depends(verify_jwt_token)):
+    """Get email outbox queue depth and sender metrics (Admin only)"""
+    return await outbox_metrics()
 
 
 @app.get("/api/admin/stats")
 async def get_admin_stats(token: dict = Depends(verify_jwt_token)):
-    """Get dashboard statistics (Admin only)"""
-    spaces_collection = get_spaces_collection()
-    bookings_collection = get_bookings_collection()
-    transactions_collection = get_transactions_collection()
-    messages_collection = get_messages_collection()
-    
-    total_spaces = await spaces_collection.count_documents({})
-    available_spaces = await spaces_collection.count_documents({"available": True})
-    total_bookings = await bookings_collection.count_documents({})
-    confirmed_bookings = await bookings_collection.count_documents({"status": "confirmed"})
-    total_revenue = await transactions_collection.aggregate([
-        {"$match": {"status": "success"}},
-        {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
-    ]).to_list(length=1)
-    unread_messages = await messages_collection.count_documents({"status": "new"})
-    
+    """Get dashboard statistics from the incrementally maintained stats document (Admin only)"""
+    stats = await read_stats()
+
     return {
-        "totalSpaces": total_spaces,
-        "availableSpaces": available_spaces,
-        "totalBookings": total_bookings,
-        "confirmedBookings": confirmed_bookings,
-        "totalRevenue": total_revenue[0]["total"] if total_revenue else 0,
-        "unreadMessages": unread_messages,
+        "totalSpaces": stats.get("total_spaces", 0),
+        "availableSpaces": stats.get("available_spaces", 0),
+        "totalBookings": stats.get("total_bookings", 0),
+        "confirmedBookings": stats.get("confirmed_bookings", 0),
+        "totalRevenue": stats.get("total_revenue", 0),
+        "unreadMessages": stats.get("unread_messages", 0),
     }
 
 
@@ -0,0 +1,135 @@
+import time
+from functools import wraps
+
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+from starlette.routing import Match
+
+# Buckets tuned for API latencies, from sub-millisecond cache hits to slow uploads
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served by route template",
+    ["method", "route"],
+)
+DEPENDENCY_CALL_DURATION = Histogram(
+    "dependency_call_duration_seconds",
+    "Outbound call latency by dependency and operation",
+    ["dependency", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DEPENDENCY_CALL_ERRORS = Counter(
+    "dependency_call_errors_total",
+    "Failed outbound calls by dependency and operation",
+    ["dependency", "operation"],
+)
+
+# Label used for requests that match no route, to keep label cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+
+def resolve_route(app, scope) -> str:
+    """Find the route template (e.g. /api/spaces/{space_id}) a request will be served by"""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Record per-route latency histograms and in-flight gauges"""
+
+    def __init__(self, app, router_app):
+        self.app = app
+        # The FastAPI instance whose routes are matched to find the template
+        self.router_app = router_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = resolve_route(self.router_app, scope)
+        status = 500
+
+        async def tracking_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, tracking_send)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(time.perf_counter() - start)
+            in_flight.dec()
+
+
+def track_dependency(dependency: str, operation: str = None):
+    """
+    Time an async service call and count its failures
+
+    A call fails if it raises or returns a result dict with success=False,
+    which is how the service modules report errors.
+    """
+    def decorator(func):
+        labels = (dependency, operation or func.__name__)
+        duration = DEPENDENCY_CALL_DURATION.labels(*labels)
+        errors = DEPENDENCY_CALL_ERRORS.labels(*labels)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - start)
+            if isinstance(result, dict) and result.get("success") is False:
+                errors.inc()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Time every MongoDB command by collection and command name"""
+
+    def __init__(self):
+        self._operations = {}
+
+    def started(self, event):
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        else:
+            collection = event.command.get(event.command_name)
+        operation = f"{collection}.{event.command_name}" if isinstance(collection, str) else event.command_name
+        self._operations[(event.connection_id, event.request_id)] = operation
+
+    def _finish(self, event, failed: bool):
+        operation = self._operations.pop((event.connection_id, event.request_id), event.command_name)
+        DEPENDENCY_CALL_DURATION.labels("mongodb", operation).observe(event.duration_micros / 1e6)
+        if failed:
+            DEPENDENCY_CALL_ERRORS.labels("mongodb", operation).inc()
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
@@ -0,0 +1,77 @@
+import json
+from typing import Iterable
+
+from fastapi import HTTPException
+
+
+class UploadTooLarge(HTTPException):
+    """Raised when a request body exceeds the configured upload limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=upload_limit_message(max_bytes))
+
+
+def upload_limit_message(max_bytes: int) -> str:
+    return f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit"
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject upload requests whose body exceeds a size limit
+
+    The declared Content-Length is checked up front, and the body is counted
+    as it streams in, so oversized uploads are cut off before they are spooled
+    to disk in full.
+    """
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self.send_too_large(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            if not response_started:
+                await self.send_too_large(send)
+
+    async def send_too_large(self, send):
+        body = json.dumps({"detail": upload_limit_message(self.max_bytes)}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
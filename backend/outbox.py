@@ -0,0 +1,182 @@
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument, UpdateOne
+from dotenv import load_dotenv
+
+from backend.database import get_outbox_collection
+from backend.services.email_service import send_email, close_smtp_connection, outbox_ready
+
+load_dotenv()
+
+# Outbox worker configuration
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BASE_DELAY = float(os.getenv("OUTBOX_RETRY_BASE_DELAY", "30"))
+OUTBOX_RETRY_MAX_DELAY = float(os.getenv("OUTBOX_RETRY_MAX_DELAY", "3600"))
+# Messages stuck in "sending" longer than this are assumed abandoned by a dead worker
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+
+# In-process counters exposed alongside the queue depth
+worker_metrics = {
+    "sent": 0,
+    "failed_attempts": 0,
+    "dead": 0,
+    "batches": 0,
+    "last_error": None,
+    "last_batch_at": None,
+}
+
+worker_task: asyncio.Task = None
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(OUTBOX_RETRY_MAX_DELAY, OUTBOX_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+async def claim_batch(limit: int = OUTBOX_BATCH_SIZE):
+    """Atomically claim up to `limit` due messages for this worker"""
+    outbox_collection = get_outbox_collection()
+    now = datetime.utcnow()
+    lease_expired = now - timedelta(seconds=OUTBOX_LEASE_SECONDS)
+
+    batch = []
+    for _ in range(limit):
+        message = await outbox_collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "pending", "next_attempt_at": {"$lte": now}},
+                    {"status": "sending", "locked_at": {"$lte": lease_expired}},
+                ]
+            },
+            {"$set": {"status": "sending", "locked_at": now}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if message is None:
+            break
+        batch.append(message)
+    return batch
+
+
+async def process_batch():
+    """
+    Send one batch of due messages over the shared SMTP connection
+
+    Returns:
+        int: Number of messages processed
+    """
+    batch = await claim_batch()
+    if not batch:
+        return 0
+
+    operations = []
+    for message in batch:
+        result = await send_email(
+            message["to_email"],
+            message["subject"],
+            message["html_content"],
+            message.get("text_content"),
+        )
+        now = datetime.utcnow()
+
+        if result["success"]:
+            worker_metrics["sent"] += 1
+            operations.append(UpdateOne(
+                {"_id": message["_id"]},
+                {"$set": {"status": "sent", "sent_at": now}, "$unset": {"locked_at": ""}},
+            ))
+            continue
+
+        attempts = message.get("attempts", 0) + 1
+        worker_metrics["failed_attempts"] += 1
+        worker_metrics["last_error"] = result.get("error")
+        update = {"attempts": attempts, "last_error": result.get("error")}
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            worker_metrics["dead"] += 1
+            update["status"] = "failed"
+        else:
+            update["status"] = "pending"
+            update["next_attempt_at"] = now + retry_delay(attempts)
+        operations.append(UpdateOne(
+            {"_id": message["_id"]},
+            {"$set": update, "$unset": {"locked_at": ""}},
+        ))
+
+    await get_outbox_collection().bulk_write(operations, ordered=False)
+    worker_metrics["batches"] += 1
+    worker_metrics["last_batch_at"] = datetime.utcnow()
+    return len(batch)
+
+
+async def run_outbox_worker():
+    """Drain the outbox forever, sleeping until new mail is queued or the poll interval passes"""
+    while True:
+        try:
+            processed = await process_batch()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            worker_metrics["last_error"] = str(e)
+            processed = 0
+
+        if processed < OUTBOX_BATCH_SIZE:
+            outbox_ready.clear()
+            try:
+                await asyncio.wait_for(outbox_ready.wait(), timeout=OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def start_outbox_worker():
+    """Start the background outbox worker"""
+    global worker_task
+    if worker_task is None:
+        worker_task = asyncio.create_task(run_outbox_worker())
+        print("✅ Email outbox worker started")
+
+
+async def stop_outbox_worker():
+    """Stop the background outbox worker and close the SMTP connection"""
+    global worker_task
+    if worker_task is not None:
+        worker_task.cancel()
+        try:
+            await worker_task
+        except asyncio.CancelledError:
+            pass
+        worker_task = None
+    await close_smtp_connection()
+    print("✅ Email outbox worker stopped")
+
+
+async def outbox_metrics():
+    """
+    Queue depth by status plus the worker's in-process counters
+
+    Returns:
+        dict: Outbox metrics
+    """
+    outbox_collection = get_outbox_collection()
+    depth = {
+        status: await outbox_collection.count_documents({"status": status})
+        for status in ("pending", "sending", "failed")
+    }
+
+    oldest = await outbox_collection.find_one(
+        {"status": "pending"}, {"created_at": 1}, sort=[("created_at", 1)]
+    )
+
+    return {
+        "pending": depth["pending"],
+        "sending": depth["sending"],
+        "failed": depth["failed"],
+        "oldest_pending_at": oldest["created_at"] if oldest else None,
+        "worker_running": worker_task is not None and not worker_task.done(),
+        "worker": dict(worker_metrics),
+    }
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+# Page size limits for admin list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(doc: dict) -> str:
+    """Build an opaque cursor pointing just past the given document"""
+    payload = {"c": doc["created_at"].isoformat(), "i": str(doc["_id"])}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Decode an opaque cursor into its (created_at, _id) pair"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+async def paginate(collection, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, query: dict = None):
+    """
+    Fetch one page of a collection ordered newest first by (created_at, _id)
+
+    Args:
+        collection: Motor collection to read from
+        cursor: Opaque cursor returned by a previous page
+        limit: Maximum number of documents to return
+        query: Optional base filter
+
+    Returns:
+        tuple: (documents, next_cursor) where next_cursor is None on the last page
+    """
+    filters = query or {}
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        keyset = {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}},
+            ]
+        }
+        filters = {"$and": [filters, keyset]} if filters else keyset
+
+    # Fetch one extra document to know whether another page exists
+    docs = await (
+        collection.find(filters)
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1])
+    return docs, next_cursor
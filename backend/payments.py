@@ -0,0 +1,215 @@
+import os
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from dotenv import load_dotenv
+
+from backend.bookings import confirm_space_hold
+from backend.cache import LRUCache, response_cache
+
+from backend.database import (
+    get_spaces_collection,
+    get_bookings_collection,
+    get_transactions_collection,
+)
+from backend.services.email_service import send_booking_confirmation
+from backend.stats import increment_stats
+
+load_dotenv()
+
+# Verified payments never change, so their summaries can be cached indefinitely
+VERIFIED_PAYMENT_CACHE_SIZE = int(os.getenv("VERIFIED_PAYMENT_CACHE_SIZE", "10000"))
+verified_payments = LRUCache(VERIFIED_PAYMENT_CACHE_SIZE)
+
+
+def booking_id_from_reference(reference: str) -> str:
+    """Extract the booking ID from an FT-<booking_id> payment reference"""
+    return reference.replace("FT-", "")
+
+
+def payment_summary(transaction: dict):
+    """Build the verify-payment response from a stored transaction"""
+    return {
+        "success": True,
+        "reference": transaction["reference"],
+        "spaceName": transaction.get("space_name"),
+        "amount": transaction["amount"],
+    }
+
+
+async def get_recorded_payment(reference: str):
+    """Return the summary for an already recorded payment from memory or MongoDB, or None"""
+    cached = verified_payments.get(reference)
+    if cached is not None:
+        return cached
+
+    transactions_collection = get_transactions_collection()
+    transaction = await transactions_collection.find_one(
+        {"reference": reference, "status": "success"},
+        {"reference": 1, "amount": 1, "space_name": 1, "booking_id": 1},
+    )
+    if transaction is None:
+        return None
+
+    # Transactions recorded before space_name was stored need a lookup
+    if not transaction.get("space_name") and transaction.get("booking_id"):
+        booking = await get_bookings_collection().find_one(
+            {"_id": ObjectId(transaction["booking_id"])}, {"space_id": 1}
+        )
+        space = booking and await get_spaces_collection().find_one(
+            {"_id": ObjectId(booking["space_id"])}, {"name": 1}
+        )
+        transaction["space_name"] = space["name"] if space else None
+
+    summary = payment_summary(transaction)
+    verified_payments.set(reference, summary)
+    return summary
+
+
+async def record_orphan_payment(reference: str, verification: dict, now: datetime):
+    """
+    Record a charge whose booking no longer exists (expired or rolled back)
+
+    The money was captured, so the transaction is kept for an admin to
+    resolve instead of failing the webhook and having Paystack retry it.
+    """
+    amount = verification["amount"] / 100  # Convert from kobo
+    try:
+        result = await get_transactions_collection().update_one(
+            {"reference": reference},
+            {
+                "$setOnInsert": {
+                    "booking_id": None,
+                    "reference": reference,
+                    "amount": amount,
+                    "status": "success",
+                    "space_name": None,
+                    "needs_review": True,
+                    "paystack_data": verification,
+                    "created_at": now,
+                }
+            },
+            upsert=True,
+        )
+        newly_recorded = result.upserted_id is not None
+    except DuplicateKeyError:
+        newly_recorded = False
+
+    if newly_recorded:
+        print(f"⚠️  Payment {reference} has no booking; recorded for review")
+        await increment_stats(total_revenue=amount)
+
+    summary = {"success": True, "reference": reference, "spaceName": None, "amount": amount}
+    verified_payments.set(reference, summary)
+    return summary
+
+
+async def record_successful_payment(reference: str, verification: dict):
+    """
+    Record a successful Paystack charge against its booking, exactly once
+
+    Safe to call repeatedly and concurrently for the same reference (webhook
+    retries, page refreshes): booking and space counters move only in the
+    call that confirms the booking, and the transaction is upserted by
+    reference, so revenue and the confirmation email fire only once. A charge
+    for a booking that no longer exists is recorded with needs_review set.
+
+    Args:
+        reference: Payment reference (FT-<booking_id>)
+        verification: Normalized charge data from paystack_service
+
+    Returns:
+        dict: Payment summary for the verify-payment response
+    """
+    bookings_collection = get_bookings_collection()
+    transactions_collection = get_transactions_collection()
+    spaces_collection = get_spaces_collection()
+
+    booking_id = booking_id_from_reference(reference)
+    now = datetime.utcnow()
+
+    # Confirm the booking and clear its expiry so the TTL index keeps it. Only
+    # the call that actually moves it out of pending sees a document here
+    previous_booking = await bookings_collection.find_one_and_update(
+        {"_id": ObjectId(booking_id), "status": {"$ne": "confirmed"}},
+        {
+            "$set": {
+                "payment_status": "completed",
+                "status": "confirmed",
+                "payment_reference": reference,
+                "updated_at": now,
+            },
+            "$unset": {"expires_at": ""},
+        },
+        return_document=ReturnDocument.BEFORE,
+    )
+    confirmed_now = previous_booking is not None
+    if not confirmed_now:
+        previous_booking = await bookings_collection.find_one({"_id": ObjectId(booking_id)})
+    if previous_booking is None:
+        return await record_orphan_payment(reference, verification, now)
+
+    if confirmed_now:
+        # Turn the hold into a sale; a lapsed hold taken by someone else needs admin follow-up
+        space_sold = await confirm_space_hold(previous_booking["space_id"], booking_id, now)
+        if not space_sold:
+            await bookings_collection.update_one(
+                {"_id": ObjectId(booking_id)}, {"$set": {"space_conflict": True}}
+            )
+        else:
+            response_cache.invalidate("/api/spaces")
+
+        await increment_stats(
+            total_bookings=int("expires_at" in previous_booking),
+            confirmed_bookings=1,
+            available_spaces=-int(space_sold),
+        )
+
+    space = await spaces_collection.find_one(
+        {"_id": ObjectId(previous_booking["space_id"])}, {"name": 1}
+    )
+    space_name = space["name"] if space else None
+    amount = verification["amount"] / 100  # Convert from kobo
+
+    # Create the transaction record only if this reference has not been seen
+    try:
+        result = await transactions_collection.update_one(
+            {"reference": reference},
+            {
+                "$setOnInsert": {
+                    "booking_id": booking_id,
+                    "reference": reference,
+                    "amount": amount,
+                    "status": "success",
+                    "space_name": space_name,
+                    "paystack_data": verification,
+                    "created_at": now,
+                }
+            },
+            upsert=True,
+        )
+        newly_recorded = result.upserted_id is not None
+    except DuplicateKeyError:
+        # A concurrent request inserted the same reference first
+        newly_recorded = False
+
+    if newly_recorded:
+        await increment_stats(total_revenue=amount)
+
+        # Queue confirmation email
+        await send_booking_confirmation(
+            {
+                "name": previous_booking["name"],
+                "email": previous_booking["email"],
+                "phone": previous_booking["phone"],
+                "space_name": space_name,
+                "booking_id": booking_id,
+                "amount": amount,
+            }
+        )
+
+    summary = {"success": True, "reference": reference, "spaceName": space_name, "amount": amount}
+    verified_payments.set(reference, summary)
+    return summary
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+from backend.database import get_bookings_collection, get_jobs_collection
+from backend.payments import record_successful_payment
+from backend.services.paystack_service import verify_payment
+
+load_dotenv()
+
+# Only bookings at least this old are rechecked, so live checkouts are left alone
+RECONCILE_MIN_AGE_MINUTES = int(os.getenv("RECONCILE_MIN_AGE_MINUTES", "30"))
+RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "100"))
+RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", "5"))
+# Paystack verify calls per second across the whole job
+RECONCILE_RATE_LIMIT = float(os.getenv("RECONCILE_RATE_LIMIT", "10"))
+
+# Checkpoint document in the jobs collection
+CHECKPOINT_ID = "payment_reconciliation"
+
+
+class RateLimiter:
+    """Space out calls so no more than `rate` start per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_slot = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def load_checkpoint(restart: bool, min_age_minutes: int):
+    """
+    Resume an unfinished pass, or start a new one
+
+    A pass covers pending bookings created before its cutoff, walked oldest
+    first by (created_at, _id); the checkpoint records the last key applied.
+    """
+    jobs_collection = get_jobs_collection()
+    checkpoint = await jobs_collection.find_one({"_id": CHECKPOINT_ID})
+    if checkpoint and checkpoint.get("status") == "running" and not restart:
+        return checkpoint
+
+    now = datetime.utcnow()
+    checkpoint = {
+        "_id": CHECKPOINT_ID,
+        "status": "running",
+        "started_at": now,
+        "cutoff": now - timedelta(minutes=min_age_minutes),
+        "last_created_at": None,
+        "last_id": None,
+        "counts": {"checked": 0, "paid": 0, "unpaid": 0, "errors": 0},
+    }
+    await jobs_collection.replace_one({"_id": CHECKPOINT_ID}, checkpoint, upsert=True)
+    return checkpoint
+
+
+def pending_query(checkpoint: dict):
+    query = {"payment_status": "pending", "created_at": {"$lt": checkpoint["cutoff"]}}
+    if checkpoint["last_id"] is not None:
+        last_created_at, last_id = checkpoint["last_created_at"], checkpoint["last_id"]
+        query["$or"] = [
+            {"created_at": {"$gt": last_created_at}},
+            {"created_at": last_created_at, "_id": {"$gt": last_id}},
+        ]
+    return query
+
+
+async def check_booking(booking: dict, semaphore: asyncio.Semaphore, limiter: RateLimiter):
+    """
+    Verify one booking with Paystack and record it if it has been paid
+
+    Returns:
+        tuple: (outcome, paystack_status) where outcome is paid, unpaid or error
+    """
+    reference = booking.get("payment_reference") or f"FT-{booking['_id']}"
+    async with semaphore:
+        await limiter.wait()
+        verification = await verify_payment(reference)
+
+    if verification["success"]:
+        try:
+            await record_successful_payment(reference, verification)
+        except Exception:
+            return "error", None
+        return "paid", "success"
+    if "status" in verification:
+        return "unpaid", verification["status"]
+    return "error", None
+
+
+async def apply_batch(batch, semaphore: asyncio.Semaphore, limiter: RateLimiter):
+    """
+    Verify a batch of bookings concurrently and write the outcomes
+
+    Paid bookings go through record_successful_payment, so the transaction,
+    space sale, stats and confirmation email happen exactly once. Every other
+    outcome is written with a single bulk_write; bookings stay pending so the
+    TTL index still removes the abandoned ones.
+    """
+    results = await asyncio.gather(*(check_booking(booking, semaphore, limiter) for booking in batch))
+
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"_id": booking["_id"], "payment_status": "pending"},
+            {"$set": {"reconciled_at": now, "paystack_status": paystack_status}},
+        )
+        for booking, (outcome, paystack_status) in zip(batch, results)
+        if outcome == "unpaid"
+    ]
+    if operations:
+        await get_bookings_collection().bulk_write(operations, ordered=False)
+
+    counts = {"checked": len(batch), "paid": 0, "unpaid": 0, "errors": 0}
+    for outcome, _ in results:
+        counts["errors" if outcome == "error" else outcome] += 1
+    return counts
+
+
+async def process_and_checkpoint(batch, checkpoint: dict, semaphore: asyncio.Semaphore, limiter: RateLimiter) -> int:
+    """Apply one batch and move the checkpoint past it"""
+    counts = await apply_batch(batch, semaphore, limiter)
+    last = batch[-1]
+    checkpoint["last_created_at"] = last["created_at"]
+    checkpoint["last_id"] = last["_id"]
+    for key, value in counts.items():
+        checkpoint["counts"][key] += value
+
+    await get_jobs_collection().update_one(
+        {"_id": CHECKPOINT_ID},
+        {
+            "$set": {
+                "last_created_at": last["created_at"],
+                "last_id": last["_id"],
+                "updated_at": datetime.utcnow(),
+            },
+            "$inc": {f"counts.{key}": value for key, value in counts.items()},
+        },
+    )
+    return len(batch)
+
+
+async def reconcile_payments(
+    restart: bool = False,
+    min_age_minutes: int = RECONCILE_MIN_AGE_MINUTES,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+    concurrency: int = RECONCILE_CONCURRENCY,
+    rate_limit: float = RECONCILE_RATE_LIMIT,
+    max_bookings: int = None,
+):
+    """
+    Recheck pending bookings against Paystack, resuming from the last checkpoint
+
+    Args:
+        restart: Discard an unfinished pass and start over
+        min_age_minutes: Skip bookings younger than this
+        batch_size: Bookings verified and written per batch
+        concurrency: Maximum Paystack requests in flight
+        rate_limit: Maximum Paystack requests started per second
+        max_bookings: Stop after this many bookings (the pass can be resumed later)
+
+    Returns:
+        dict: The checkpoint document, with running totals for the pass
+    """
+    bookings_collection = get_bookings_collection()
+    jobs_collection = get_jobs_collection()
+    checkpoint = await load_checkpoint(restart, min_age_minutes)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate_limit)
+    processed = 0
+
+    cursor = (
+        bookings_collection.find(
+            pending_query(checkpoint),
+            {"created_at": 1, "payment_reference": 1},
+        )
+        .sort([("created_at", 1), ("_id", 1)])
+        .batch_size(batch_size)
+    )
+
+    batch = []
+    finished = True
+    async for booking in cursor:
+        batch.append(booking)
+        if len(batch) < batch_size:
+            continue
+        processed += await process_and_checkpoint(batch, checkpoint, semaphore, limiter)
+        batch = []
+        if max_bookings and processed >= max_bookings:
+            finished = False
+            break
+    if batch and finished:
+        await process_and_checkpoint(batch, checkpoint, semaphore, limiter)
+
+    if finished:
+        checkpoint["status"] = "completed"
+        checkpoint["completed_at"] = datetime.utcnow()
+        await jobs_collection.update_one(
+            {"_id": CHECKPOINT_ID},
+            {"$set": {"status": "completed", "completed_at": checkpoint["completed_at"]}},
+        )
+    return checkpoint
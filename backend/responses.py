@@ -0,0 +1,35 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.responses import JSONResponse
+
+
+def bson_default(obj):
+    """Encode the BSON types orjson does not handle natively"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return float(obj.to_decimal())
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize MongoDB documents to JSON in a single pass
+
+    ObjectId, datetime (including nested ones) and Decimal128 are encoded
+    directly, so documents can be returned as read from Motor.
+    """
+    return orjson.dumps(content, default=bson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class BSONJSONResponse(JSONResponse):
+    """JSON response that encodes raw MongoDB documents with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
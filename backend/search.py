@@ -0,0 +1,109 @@
+import os
+import re
+from typing import Optional
+
+from bson import ObjectId
+from dotenv import load_dotenv
+
+from backend.database import get_bookings_collection, get_messages_collection
+
+load_dotenv()
+
+# Counts stop here so broad searches never scan whole collections
+SEARCH_COUNT_LIMIT = int(os.getenv("SEARCH_COUNT_LIMIT", "1000"))
+SEARCH_MAX_TIME_MS = int(os.getenv("SEARCH_MAX_TIME_MS", "2000"))
+
+# Searchable collections: collection getter, payment reference field, allowed statuses
+SEARCHES = {
+    "bookings": (get_bookings_collection, "payment_reference", {"pending", "confirmed", "cancelled"}),
+    "messages": (get_messages_collection, None, {"new", "read", "responded"}),
+}
+
+PHONE_PATTERN = re.compile(r"^\+?[\d\s()-]{4,}$")
+REFERENCE_PATTERN = re.compile(r"^FT-[0-9a-f]*$", re.IGNORECASE)
+
+
+def phone_prefixes(q: str):
+    """Prefixes a phone number may be stored under: as typed, and in local or international form"""
+    digits = re.sub(r"\D", "", q)
+    prefixes = {q.strip(), digits}
+    if digits.startswith("0"):
+        prefixes.update({"+234" + digits[1:], "234" + digits[1:]})
+    elif digits.startswith("234"):
+        prefixes.update({"+" + digits, "0" + digits[3:]})
+    return sorted(prefixes)
+
+
+def prefix_regex(prefix: str):
+    # Anchored, case-sensitive regexes can be answered from an index range scan
+    return re.compile("^" + re.escape(prefix))
+
+
+def build_search(q: Optional[str], reference_field: Optional[str] = None):
+    """
+    Turn a search string into a MongoDB filter, projection and sort
+
+    Payment references, emails and phone numbers become anchored prefix
+    lookups on their own indexes, ordered newest first. Anything else is a
+    full-text search ordered by relevance.
+
+    Returns:
+        tuple: (filter, projection, sort)
+    """
+    newest_first = [("created_at", -1), ("_id", -1)]
+    if not q:
+        return {}, None, newest_first
+
+    q = q.strip()
+    if reference_field and REFERENCE_PATTERN.match(q):
+        # References are FT- followed by a lowercase hex booking ID
+        booking_id = q[3:].lower()
+        query = {reference_field: prefix_regex("FT-" + booking_id)}
+        # payment_reference is only set on confirmation, so a full reference also matches the booking itself
+        if ObjectId.is_valid(booking_id):
+            query = {"$or": [query, {"_id": ObjectId(booking_id)}]}
+        return query, None, newest_first
+    if "@" in q:
+        return {"email": prefix_regex(q)}, None, newest_first
+    if PHONE_PATTERN.match(q):
+        return {"phone": {"$in": [prefix_regex(prefix) for prefix in phone_prefixes(q)]}}, None, newest_first
+
+    projection = {"score": {"$meta": "textScore"}}
+    return {"$text": {"$search": q}}, projection, [("score", {"$meta": "textScore"}), ("_id", -1)]
+
+
+async def search_collection(name: str, q: Optional[str], status: Optional[str], skip: int, limit: int):
+    """
+    Search bookings or messages
+
+    Args:
+        name: Key of SEARCHES
+        q: Name, email, phone, company, message text or payment reference
+        status: Optional exact status filter
+        skip: Number of results to skip
+        limit: Maximum number of results to return
+
+    Returns:
+        dict: items, total (capped at SEARCH_COUNT_LIMIT) and whether total is an estimate
+    """
+    get_collection, reference_field, _ = SEARCHES[name]
+    collection = get_collection(read_only=True)
+
+    query, projection, sort = build_search(q, reference_field)
+    if status:
+        query["status"] = status
+
+    items = await (
+        collection.find(query, projection)
+        .sort(sort)
+        .skip(skip)
+        .limit(limit)
+        .max_time_ms(SEARCH_MAX_TIME_MS)
+        .to_list(length=limit)
+    )
+    total = await collection.count_documents(query, limit=SEARCH_COUNT_LIMIT, maxTimeMS=SEARCH_MAX_TIME_MS)
+    return {
+        "items": items,
+        "total": total,
+        "total_is_estimate": total >= SEARCH_COUNT_LIMIT,
+    }
@@ -1,9 +1,21 @@
+import asyncio
+import base64
+import io
+import re
+import time
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
+import cloudinary.utils
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO, List, Optional, Union
+import httpx
 from dotenv import load_dotenv
 
+from backend.metrics import track_dependency
+
 load_dotenv()
 
 # Configure Cloudinary
@@ -13,15 +25,63 @@ cloudinary.config(
     api_secret=os.getenv("CLOUDINARY_API_SECRET"),
 )
 
+# The Cloudinary SDK is synchronous, so calls run on a bounded thread pool
+CLOUDINARY_MAX_CONCURRENT_UPLOADS = int(os.getenv("CLOUDINARY_MAX_CONCURRENT_UPLOADS", "4"))
+# Videos, and images larger than this, are sent in chunks of this size instead of one request
+CLOUDINARY_CHUNK_SIZE = int(os.getenv("CLOUDINARY_CHUNK_SIZE_MB", "20")) * 1024 * 1024
+
+# Most public IDs the Admin API deletes in one call
+CLOUDINARY_DELETE_BATCH_SIZE = 100
+
+# Cloudinary rejects upload signatures whose timestamp is older than this
+UPLOAD_SIGNATURE_TTL_SECONDS = 3600
+
+# Responsive variants stored with every uploaded image
+IMAGE_VARIANT_WIDTHS = sorted(int(width) for width in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,960,1280,1920").split(","))
+IMAGE_VARIANT_FORMATS = os.getenv("IMAGE_VARIANT_FORMATS", "avif,webp,jpg").split(",")
+IMAGE_PLACEHOLDER_WIDTH = int(os.getenv("IMAGE_PLACEHOLDER_WIDTH", "24"))
+IMAGE_PLACEHOLDER_TIMEOUT = float(os.getenv("IMAGE_PLACEHOLDER_TIMEOUT", "5"))
+
+# Fields responsive_image adds to gallery and space documents
+IMAGE_FIELDS = ("width", "height", "placeholder", "srcset")
+
+upload_executor = ThreadPoolExecutor(
+    max_workers=CLOUDINARY_MAX_CONCURRENT_UPLOADS,
+    thread_name_prefix="cloudinary",
+)
+
+
+async def run_in_upload_pool(func, *args, **kwargs):
+    """Run a blocking Cloudinary SDK call on the upload pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(upload_executor, partial(func, *args, **kwargs))
 
-async def upload_image(file_data: bytes, folder: str = "fombina-tower", public_id: str = None):
+
+def remaining_size(file_data: Union[bytes, BinaryIO]) -> int:
+    """Number of bytes left to read from file_data, without consuming it"""
+    if isinstance(file_data, bytes):
+        return len(file_data)
+    position = file_data.tell()
+    end = file_data.seek(0, io.SEEK_END)
+    file_data.seek(position)
+    return end - position
+
+
+@track_dependency("cloudinary")
+async def upload_image(
+    file_data: Union[bytes, BinaryIO],
+    folder: str = "fombina-tower",
+    public_id: str = None,
+    resource_type: str = "image",
+):
     """
-    Upload image to Cloudinary
+    Upload image or video to Cloudinary
     
     Args:
-        file_data: Image file bytes
+        file_data: File bytes or a readable file object, read from its current position
         folder: Cloudinary folder name
         public_id: Optional custom public ID
+        resource_type: Cloudinary resource type ("image" or "video")
     
     Returns:
         dict: Upload result with secure_url
@@ -29,43 +89,102 @@ async def upload_image(file_data: bytes, folder: str = "fombina-tower", public_i
     try:
         upload_options = {
             "folder": folder,
-            "resource_type": "image",
-            "quality": "auto:good",
-            "fetch_format": "auto",
+            "resource_type": resource_type,
         }
+        if resource_type == "image":
+            upload_options["quality"] = "auto:good"
+            upload_options["fetch_format"] = "auto"
         
         if public_id:
             upload_options["public_id"] = public_id
         
-        result = cloudinary.uploader.upload(file_data, **upload_options)
-        return {
+        # upload() reads the whole file into memory, so only small images go through it
+        if resource_type == "video" or remaining_size(file_data) > CLOUDINARY_CHUNK_SIZE:
+            if isinstance(file_data, bytes):
+                file_data = io.BytesIO(file_data)
+            result = await run_in_upload_pool(
+                cloudinary.uploader.upload_large,
+                file_data,
+                chunk_size=CLOUDINARY_CHUNK_SIZE,
+                **upload_options,
+            )
+        else:
+            result = await run_in_upload_pool(cloudinary.uploader.upload, file_data, **upload_options)
+        uploaded = {
             "success": True,
             "url": result["secure_url"],
             "public_id": result["public_id"],
-            "width": result["width"],
-            "height": result["height"],
+            "width": result.get("width"),
+            "height": result.get("height"),
         }
+        if resource_type == "image":
+            uploaded.update(await responsive_image(result["public_id"], result.get("width"), result.get("height")))
+        return uploaded
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-async def delete_image(public_id: str):
+@track_dependency("cloudinary")
+async def delete_image(public_id: str, resource_type: str = "image"):
     """
     Delete image from Cloudinary
     
     Args:
         public_id: Cloudinary public ID
+        resource_type: Cloudinary resource type ("image" or "video")
     
     Returns:
         dict: Deletion result
     """
     try:
-        result = cloudinary.uploader.destroy(public_id)
+        result = await run_in_upload_pool(cloudinary.uploader.destroy, public_id, resource_type=resource_type)
         return {"success": True, "result": result}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+@track_dependency("cloudinary")
+async def delete_image_batch(public_ids: List[str], resource_type: str = "image"):
+    """
+    Delete up to CLOUDINARY_DELETE_BATCH_SIZE assets with one Admin API call
+
+    Returns:
+        dict: Deletion result with the status ("deleted" or "not_found") of each public ID
+    """
+    try:
+        result = await run_in_upload_pool(cloudinary.api.delete_resources, public_ids, resource_type=resource_type)
+        return {"success": True, "deleted": result.get("deleted", {})}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+async def delete_images(public_ids: List[str], resource_type: str = "image"):
+    """
+    Delete many assets from Cloudinary in batches
+
+    Args:
+        public_ids: Cloudinary public IDs, all of the same resource type
+        resource_type: Cloudinary resource type ("image" or "video")
+
+    Returns:
+        dict: Per public ID, {"success": True, "result": status} or {"success": False, "error": ...}
+    """
+    batches = [
+        public_ids[start:start + CLOUDINARY_DELETE_BATCH_SIZE]
+        for start in range(0, len(public_ids), CLOUDINARY_DELETE_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(*(delete_image_batch(batch, resource_type) for batch in batches))
+
+    outcomes = {}
+    for batch, result in zip(batches, results):
+        for public_id in batch:
+            if result["success"]:
+                outcomes[public_id] = {"success": True, "result": result["deleted"].get(public_id, "not_found")}
+            else:
+                outcomes[public_id] = {"success": False, "error": result["error"]}
+    return outcomes
+
+
 async def get_image_url(public_id: str, transformation: dict = None):
     """
     Get optimized image URL with optional transformations
@@ -80,3 +199,122 @@ async def get_image_url(public_id: str, transformation: dict = None):
     if transformation:
         return cloudinary.CloudinaryImage(public_id).build_url(**transformation)
     return cloudinary.CloudinaryImage(public_id).build_url()
+
+
+def sign_upload(resource_type: str = "image", folder: str = "fombina-tower"):
+    """
+    Sign parameters for an upload straight from the browser to Cloudinary
+
+    Args:
+        resource_type: Cloudinary resource type ("image" or "video")
+        folder: Cloudinary folder the upload is restricted to
+
+    Returns:
+        dict: Upload URL and the form fields to post with the file
+    """
+    config = cloudinary.config()
+    timestamp = int(time.time())
+    params = {"folder": folder, "timestamp": timestamp}
+    return {
+        "upload_url": f"https://api.cloudinary.com/v1_1/{config.cloud_name}/{resource_type}/upload",
+        "api_key": config.api_key,
+        "folder": folder,
+        "timestamp": timestamp,
+        "signature": cloudinary.utils.api_sign_request(params, config.api_secret),
+        "expires_at": timestamp + UPLOAD_SIGNATURE_TTL_SECONDS,
+    }
+
+
+def verify_upload(public_id: str, version: int, signature: str, folder: str = "fombina-tower") -> bool:
+    """Check that a browser-reported upload result really came from Cloudinary for our folder"""
+    if not public_id.startswith(folder + "/"):
+        return False
+    return cloudinary.utils.verify_api_response_signature(public_id, version, signature)
+
+
+def delivery_url(public_id: str, version: int, file_format: str, resource_type: str = "image") -> str:
+    """The secure_url Cloudinary reports for an upload, rebuilt from its signed fields"""
+    url, _ = cloudinary.utils.cloudinary_url(
+        public_id, version=version, format=file_format, resource_type=resource_type, secure=True
+    )
+    return url
+
+
+def variant_widths(width: Optional[int] = None):
+    """Variant widths for an image, never upscaling past its own width"""
+    if not width:
+        return IMAGE_VARIANT_WIDTHS
+    widths = [candidate for candidate in IMAGE_VARIANT_WIDTHS if candidate < width]
+    if width <= IMAGE_VARIANT_WIDTHS[-1]:
+        widths.append(width)
+    return widths or [IMAGE_VARIANT_WIDTHS[0]]
+
+
+def variant_url(public_id: str, width: int, image_format: str) -> str:
+    return cloudinary.CloudinaryImage(public_id).build_url(
+        width=width, crop="limit", quality="auto", format=image_format, secure=True
+    )
+
+
+def build_srcsets(public_id: str, width: Optional[int] = None) -> dict:
+    """
+    Build a srcset string per output format
+
+    Returns:
+        dict: Format name to srcset, e.g. {"webp": "https://... 320w, https://... 640w"}
+    """
+    widths = variant_widths(width)
+    return {
+        image_format: ", ".join(f"{variant_url(public_id, w, image_format)} {w}w" for w in widths)
+        for image_format in IMAGE_VARIANT_FORMATS
+    }
+
+
+@track_dependency("cloudinary")
+async def fetch_placeholder(public_id: str) -> str:
+    """
+    Fetch a tiny blurred rendition of an image and inline it as a data URI
+
+    Falls back to the rendition's URL if it cannot be fetched.
+    """
+    url = cloudinary.CloudinaryImage(public_id).build_url(
+        width=IMAGE_PLACEHOLDER_WIDTH, crop="scale", effect="blur:1000", quality="auto:low", format="jpg", secure=True
+    )
+    try:
+        async with httpx.AsyncClient(timeout=IMAGE_PLACEHOLDER_TIMEOUT) as http:
+            response = await http.get(url)
+            response.raise_for_status()
+    except httpx.HTTPError:
+        return url
+    return "data:image/jpeg;base64," + base64.b64encode(response.content).decode("ascii")
+
+
+async def responsive_image(public_id: str, width: Optional[int] = None, height: Optional[int] = None) -> dict:
+    """
+    Precompute what the frontend needs to serve an image responsively
+
+    Args:
+        public_id: Cloudinary public ID
+        width: Original width in pixels, if known
+        height: Original height in pixels, if known
+
+    Returns:
+        dict: width, height, placeholder and per-format srcset
+    """
+    return {
+        "width": width,
+        "height": height,
+        "placeholder": await fetch_placeholder(public_id),
+        "srcset": build_srcsets(public_id, width),
+    }
+
+
+def public_id_from_url(url: str) -> Optional[str]:
+    """Extract the public ID from a secure_url of an image in our Cloudinary account"""
+    cloud_name = cloudinary.config().cloud_name
+    if not url or not cloud_name:
+        return None
+    match = re.match(
+        rf"^https?://res\.cloudinary\.com/{re.escape(cloud_name)}/image/upload/v\d+/(.+)\.\w+$", url
+    )
+    return match.group(1) if match else None
@@ -1,9 +1,14 @@
-import smtplib
+import asyncio
+import aiosmtplib
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 from dotenv import load_dotenv
 
+from backend.database import get_outbox_collection
+from backend.metrics import track_dependency
+
 load_dotenv()
 
 # SMTP Configuration
@@ -13,11 +18,83 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 FROM_EMAIL = os.getenv("FROM_EMAIL", SMTP_USER)
 FROM_NAME = os.getenv("FROM_NAME", "Fombina Tower")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+# Upgrade plain connections with STARTTLS (ignored on implicit-TLS port 465)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+
+# Persistent SMTP connection, reused across sends
+smtp_client: aiosmtplib.SMTP = None
+smtp_lock = asyncio.Lock()
+
+# Set whenever a message is queued so the outbox worker wakes immediately
+outbox_ready = asyncio.Event()
 
 
+def build_message(to_email: str, subject: str, html_content: str, text_content: str = None):
+    """Build a MIME message with an optional plain text fallback"""
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
+    message["To"] = to_email
+    
+    # Add text and HTML parts
+    if text_content:
+        part1 = MIMEText(text_content, "plain")
+        message.attach(part1)
+    
+    part2 = MIMEText(html_content, "html")
+    message.attach(part2)
+    return message
+
+
+async def get_smtp_connection():
+    """Get the shared SMTP connection, connecting and logging in if needed"""
+    global smtp_client
+    if smtp_client is not None and smtp_client.is_connected:
+        return smtp_client
+
+    client = aiosmtplib.SMTP(
+        hostname=SMTP_HOST,
+        port=SMTP_PORT,
+        start_tls=SMTP_STARTTLS and SMTP_PORT != 465,
+        use_tls=SMTP_PORT == 465,
+        timeout=SMTP_TIMEOUT,
+    )
+    try:
+        await client.connect()
+        if SMTP_USER:
+            await client.login(SMTP_USER, SMTP_PASSWORD)
+    except Exception:
+        client.close()
+        raise
+    # Only share a connection once it is fully authenticated
+    smtp_client = client
+    return smtp_client
+
+
+def discard_smtp_connection():
+    """Drop the shared SMTP connection without a QUIT, e.g. after an error"""
+    global smtp_client
+    if smtp_client is not None:
+        smtp_client.close()
+    smtp_client = None
+
+
+async def close_smtp_connection():
+    """Close the shared SMTP connection"""
+    global smtp_client
+    if smtp_client is not None and smtp_client.is_connected:
+        try:
+            await smtp_client.quit()
+        except aiosmtplib.SMTPException:
+            smtp_client.close()
+    smtp_client = None
+
+
+@track_dependency("smtp")
 async def send_email(to_email: str, subject: str, html_content: str, text_content: str = None):
     """
-    Send email via SMTP
+    Send email via SMTP over the shared connection
     
     Args:
         to_email: Recipient email address
@@ -29,31 +106,61 @@ async def send_email(to_email: str, subject: str, html_content: str, text_conten
         dict: Send result
     """
     try:
-        # Create message
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
-        message["To"] = to_email
-        
-        # Add text and HTML parts
-        if text_content:
-            part1 = MIMEText(text_content, "plain")
-            message.attach(part1)
-        
-        part2 = MIMEText(html_content, "html")
-        message.attach(part2)
-        
-        # Send email
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(message)
+        message = build_message(to_email, subject, html_content, text_content)
+
+        async with smtp_lock:
+            try:
+                try:
+                    server = await get_smtp_connection()
+                    await server.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # The server dropped an idle connection; reconnect once
+                    discard_smtp_connection()
+                    server = await get_smtp_connection()
+                    await server.send_message(message)
+            except Exception:
+                # Never reuse a connection left in an unknown state
+                discard_smtp_connection()
+                raise
         
         return {"success": True, "message": "Email sent successfully"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+async def enqueue_email(to_email: str, subject: str, html_content: str, text_content: str = None):
+    """
+    Queue an email in the outbox for the background sender
+    
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        html_content: HTML email content
+        text_content: Plain text fallback (optional)
+    
+    Returns:
+        dict: Queue result
+    """
+    try:
+        now = datetime.utcnow()
+        result = await get_outbox_collection().insert_one(
+            {
+                "to_email": to_email,
+                "subject": subject,
+                "html_content": html_content,
+                "text_content": text_content,
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            }
+        )
+        outbox_ready.set()
+        return {"success": True, "message": "Email queued", "outbox_id": str(result.inserted_id)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 async def send_booking_confirmation(booking_data: dict):
     """Send booking confirmation email"""
     subject = f"Booking Confirmation - {booking_data['space_name']}"
@@ -106,7 +213,7 @@ async def send_booking_confirmation(booking_data: dict):
     </html>
     """
     
-    return await send_email(booking_data['email'], subject, html_content)
+    return await enqueue_email(booking_data['email'], subject, html_content)
 
 
 async def send_contact_notification(contact_data: dict):
@@ -133,4 +240,4 @@ async def send_contact_notification(contact_data: dict):
     """
     
     admin_email = os.getenv("ADMIN_EMAIL", "admin@fombinatower.com")
-    return await send_email(admin_email, subject, html_content)
+    return await enqueue_email(admin_email, subject, html_content)
@@ -1,13 +1,83 @@
+import asyncio
+import hashlib
+import hmac
+import random
 import httpx
 import os
 from dotenv import load_dotenv
 
+from backend.metrics import track_dependency
+
 load_dotenv()
 
 PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY")
-PAYSTACK_BASE_URL = "https://api.paystack.co"
+PAYSTACK_BASE_URL = os.getenv("PAYSTACK_BASE_URL", "https://api.paystack.co")
+
+# HTTP client configuration
+PAYSTACK_CONNECT_TIMEOUT = float(os.getenv("PAYSTACK_CONNECT_TIMEOUT", "5"))
+PAYSTACK_READ_TIMEOUT = float(os.getenv("PAYSTACK_READ_TIMEOUT", "15"))
+PAYSTACK_MAX_CONNECTIONS = int(os.getenv("PAYSTACK_MAX_CONNECTIONS", "100"))
+PAYSTACK_MAX_KEEPALIVE = int(os.getenv("PAYSTACK_MAX_KEEPALIVE", "20"))
+PAYSTACK_MAX_RETRIES = int(os.getenv("PAYSTACK_MAX_RETRIES", "3"))
+PAYSTACK_RETRY_BASE_DELAY = float(os.getenv("PAYSTACK_RETRY_BASE_DELAY", "0.25"))
+
+# Status codes worth retrying for idempotent requests
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Global HTTP client, shared for the lifetime of the app
+client: httpx.AsyncClient = None
+
+
+def get_paystack_client():
+    """Get the shared Paystack HTTP client, creating it on first use"""
+    global client
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=PAYSTACK_BASE_URL,
+            headers={"Authorization": f"Bearer {PAYSTACK_SECRET_KEY}"},
+            timeout=httpx.Timeout(PAYSTACK_READ_TIMEOUT, connect=PAYSTACK_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=PAYSTACK_MAX_CONNECTIONS,
+                max_keepalive_connections=PAYSTACK_MAX_KEEPALIVE,
+            ),
+        )
+    return client
+
+
+async def start_paystack_client():
+    """Create the shared Paystack HTTP client at app startup"""
+    get_paystack_client()
+    print("✅ Paystack HTTP client ready")
+
+
+async def close_paystack_client():
+    """Close the shared Paystack HTTP client"""
+    global client
+    if client:
+        await client.aclose()
+        client = None
+        print("✅ Paystack HTTP client closed")
 
 
+async def request_with_retries(method: str, url: str, **kwargs):
+    """
+    Send an idempotent request, retrying transport errors and transient statuses
+
+    Retries use exponential backoff with full jitter, up to PAYSTACK_MAX_RETRIES.
+    """
+    paystack_client = get_paystack_client()
+    for attempt in range(PAYSTACK_MAX_RETRIES + 1):
+        try:
+            response = await paystack_client.request(method, url, **kwargs)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == PAYSTACK_MAX_RETRIES:
+                return response
+        except httpx.TransportError:
+            if attempt == PAYSTACK_MAX_RETRIES:
+                raise
+        await asyncio.sleep(random.uniform(0, PAYSTACK_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+@track_dependency("paystack")
 async def initialize_payment(email: str, amount: int, reference: str, metadata: dict = None):
     """
     Initialize Paystack payment
@@ -22,11 +92,6 @@ async def initialize_payment(email: str, amount: int, reference: str, metadata:
         dict: Payment initialization result
     """
     try:
-        headers = {
-            "Authorization": f"Bearer {PAYSTACK_SECRET_KEY}",
-            "Content-Type": "application/json",
-        }
-        
         payload = {
             "email": email,
             "amount": amount,
@@ -37,27 +102,25 @@ async def initialize_payment(email: str, amount: int, reference: str, metadata:
         if metadata:
             payload["metadata"] = metadata
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{PAYSTACK_BASE_URL}/transaction/initialize",
-                json=payload,
-                headers=headers,
-            )
-            result = response.json()
-            
-            if result.get("status"):
-                return {
-                    "success": True,
-                    "authorization_url": result["data"]["authorization_url"],
-                    "access_code": result["data"]["access_code"],
-                    "reference": result["data"]["reference"],
-                }
-            else:
-                return {"success": False, "error": result.get("message", "Payment initialization failed")}
+        # Initialization is not idempotent, so it is sent exactly once
+        paystack_client = get_paystack_client()
+        response = await paystack_client.post("/transaction/initialize", json=payload)
+        result = response.json()
+        
+        if result.get("status"):
+            return {
+                "success": True,
+                "authorization_url": result["data"]["authorization_url"],
+                "access_code": result["data"]["access_code"],
+                "reference": result["data"]["reference"],
+            }
+        else:
+            return {"success": False, "error": result.get("message", "Payment initialization failed")}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+@track_dependency("paystack")
 async def verify_payment(reference: str):
     """
     Verify Paystack payment
@@ -69,26 +132,69 @@ async def verify_payment(reference: str):
         dict: Payment verification result
     """
     try:
-        headers = {
-            "Authorization": f"Bearer {PAYSTACK_SECRET_KEY}",
-        }
+        response = await request_with_retries("GET", f"/transaction/verify/{reference}")
+        result = response.json()
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{PAYSTACK_BASE_URL}/transaction/verify/{reference}",
-                headers=headers,
-            )
-            result = response.json()
-            
-            if result.get("status") and result["data"]["status"] == "success":
-                return {
-                    "success": True,
-                    "amount": result["data"]["amount"],
-                    "customer": result["data"]["customer"],
-                    "paid_at": result["data"]["paid_at"],
-                    "reference": result["data"]["reference"],
-                }
-            else:
-                return {"success": False, "error": "Payment verification failed"}
+        if result.get("status") and result["data"]["status"] == "success":
+            return {
+                "success": True,
+                "amount": result["data"]["amount"],
+                "customer": result["data"]["customer"],
+                "paid_at": result["data"]["paid_at"],
+                "reference": result["data"]["reference"],
+            }
+        elif result.get("status"):
+            # Paystack knows the transaction but it is not paid (e.g. abandoned, failed)
+            return {"success": False, "error": "Payment verification failed", "status": result["data"]["status"]}
+        elif "reference not found" in (result.get("message") or "").lower():
+            # No transaction was ever started with this reference, so nothing was paid
+            return {"success": False, "error": result["message"], "status": "not_found"}
+        else:
+            return {"success": False, "error": result.get("message", "Payment verification failed")}
     except Exception as e:
         return {"success": False, "error": str(e)}
+
+
+def verify_webhook_signature(body: bytes, signature: str) -> bool:
+    """
+    Check a webhook's x-paystack-signature header
+    
+    Args:
+        body: Raw request body
+        signature: Value of the x-paystack-signature header
+    
+    Returns:
+        bool: True if the body was signed with our secret key
+    """
+    if not signature or not PAYSTACK_SECRET_KEY:
+        return False
+    expected = hmac.new(PAYSTACK_SECRET_KEY.encode("utf-8"), body, hashlib.sha512).hexdigest()
+    try:
+        # Compare bytes: compare_digest raises TypeError on non-ASCII str
+        return hmac.compare_digest(expected.encode("ascii"), signature.encode("utf-8"))
+    except (AttributeError, UnicodeError):
+        return False
+
+
+def parse_charge_event(event: dict):
+    """
+    Normalize a charge.success webhook event to the verify_payment result shape
+    
+    Args:
+        event: Parsed webhook payload
+    
+    Returns:
+        dict: Payment verification result
+    """
+    data = (event.get("data") or {}) if isinstance(event, dict) else {}
+    if not isinstance(event, dict) or event.get("event") != "charge.success" or data.get("status") != "success":
+        return {"success": False, "error": "Not a successful charge"}
+    if not data.get("reference") or data.get("amount") is None:
+        return {"success": False, "error": "Charge is missing its reference or amount"}
+    return {
+        "success": True,
+        "amount": data["amount"],
+        "customer": data.get("customer"),
+        "paid_at": data.get("paid_at"),
+        "reference": data["reference"],
+    }
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from backend.database import (
+    get_stats_collection,
+    get_spaces_collection,
+    get_bookings_collection,
+    get_transactions_collection,
+    get_messages_collection,
+)
+
+# The dashboard counters live in a single document
+STATS_ID = "dashboard"
+
+STAT_FIELDS = (
+    "total_spaces",
+    "available_spaces",
+    "total_bookings",
+    "confirmed_bookings",
+    "total_revenue",
+    "unread_messages",
+)
+
+
+async def increment_stats(**deltas):
+    """
+    Atomically apply counter deltas to the dashboard stats document
+
+    The document is never created here: an upsert would leave it holding only
+    the incremented counters, so a missing document is rebuilt from the source
+    collections instead, which already include the change being counted.
+
+    Args:
+        **deltas: Counter name to increment (negative values decrement)
+    """
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    stats_collection = get_stats_collection()
+    result = await stats_collection.update_one(
+        {"_id": STATS_ID},
+        {"$inc": deltas, "$set": {"updated_at": datetime.utcnow()}},
+    )
+    if result.matched_count == 0:
+        await rebuild_stats()
+
+
+async def rebuild_stats():
+    """
+    Recompute the dashboard stats document from the source collections
+
+    Returns:
+        dict: The rebuilt stats document
+    """
+    spaces_collection = get_spaces_collection()
+    bookings_collection = get_bookings_collection()
+    transactions_collection = get_transactions_collection()
+    messages_collection = get_messages_collection()
+
+    total_revenue = await transactions_collection.aggregate([
+        {"$match": {"status": "success"}},
+        {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+    ]).to_list(length=1)
+
+    stats = {
+        "total_spaces": await spaces_collection.count_documents({}),
+        "available_spaces": await spaces_collection.count_documents({"available": True}),
+        # Unpaid holds carry an expires_at and are not counted until confirmed
+        "total_bookings": await bookings_collection.count_documents({"expires_at": {"$exists": False}}),
+        "confirmed_bookings": await bookings_collection.count_documents({"status": "confirmed"}),
+        "total_revenue": total_revenue[0]["total"] if total_revenue else 0,
+        "unread_messages": await messages_collection.count_documents({"status": "new"}),
+        "updated_at": datetime.utcnow(),
+    }
+
+    await get_stats_collection().replace_one({"_id": STATS_ID}, stats, upsert=True)
+    return stats
+
+
+async def read_stats():
+    """Read the dashboard stats document, rebuilding it if it is missing or incomplete"""
+    stats = await get_stats_collection().find_one({"_id": STATS_ID})
+    # Older releases could upsert a document holding only the incremented counters
+    if stats is None or any(field not in stats for field in STAT_FIELDS):
+        stats = await rebuild_stats()
+    return stats
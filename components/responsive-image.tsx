@@ -0,0 +1,58 @@
+/** @format */
+
+import type { ResponsiveImageFields } from '@/lib/types';
+
+interface ResponsiveImageProps {
+  src: string;
+  alt: string;
+  image?: ResponsiveImageFields;
+  sizes?: string;
+  className?: string;
+  priority?: boolean;
+}
+
+/**
+ * Serves the smallest precomputed variant the browser can use (AVIF, then
+ * WebP, then JPEG), with the blurred placeholder shown until it loads.
+ * Falls back to a plain <img> for images without variants.
+ */
+export function ResponsiveImage({
+  src,
+  alt,
+  image,
+  sizes = '100vw',
+  className,
+  priority = false,
+}: ResponsiveImageProps) {
+  const srcset = image?.srcset;
+  const placeholderStyle = image?.placeholder
+    ? {
+        backgroundImage: `url("${image.placeholder}")`,
+        backgroundSize: 'cover',
+        backgroundPosition: 'center',
+      }
+    : undefined;
+
+  return (
+    <picture className='contents'>
+      {srcset?.avif && (
+        <source type='image/avif' srcSet={srcset.avif} sizes={sizes} />
+      )}
+      {srcset?.webp && (
+        <source type='image/webp' srcSet={srcset.webp} sizes={sizes} />
+      )}
+      <img
+        src={src}
+        srcSet={srcset?.jpg}
+        sizes={srcset?.jpg ? sizes : undefined}
+        alt={alt}
+        width={image?.width ?? undefined}
+        height={image?.height ?? undefined}
+        loading={priority ? 'eager' : 'lazy'}
+        decoding='async'
+        style={placeholderStyle}
+        className={className}
+      />
+    </picture>
+  );
+}
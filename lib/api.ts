@@ -2,8 +2,9 @@
 
 const API_BASE_URL = 'https://fombina-backend.onrender.com';
 
-export async function fetchSpaces() {
-  const response = await fetch(`${API_BASE_URL}/api/spaces`);
+export async function fetchSpaces(params?: Record<string, string>) {
+  const query = params ? `?${new URLSearchParams(params)}` : '';
+  const response = await fetch(`${API_BASE_URL}/api/spaces${query}`);
   if (!response.ok) throw new Error('Failed to fetch spaces');
   return response.json();
 }
@@ -44,6 +45,20 @@ export async function fetchTimeline() {
   return response.json();
 }
 
+export async function fetchHomeBundle(params?: {
+  spaces_limit?: number;
+  gallery_limit?: number;
+  timeline_limit?: number;
+}) {
+  const query = new URLSearchParams();
+  Object.entries(params || {}).forEach(([key, value]) => {
+    if (value !== undefined) query.set(key, String(value));
+  });
+  const response = await fetch(`${API_BASE_URL}/api/bundle/home?${query}`);
+  if (!response.ok) throw new Error('Failed to fetch homepage data');
+  return response.json();
+}
+
 export async function submitContact(contactData: any) {
   const response = await fetch(`${API_BASE_URL}/api/contact`, {
     method: 'POST',
@@ -127,22 +142,48 @@ export async function confirmPasswordReset(token: string, newPassword: string) {
   return response.json();
 }
 
-export async function fetchTransactions(token: string) {
-  const response = await fetch(`${API_BASE_URL}/api/admin/transactions`, {
+export async function fetchTransactions(token: string, cursor?: string) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE_URL}/api/admin/transactions${query}`, {
     headers: { Authorization: `Bearer ${token}` },
   });
   if (!response.ok) throw new Error('Failed to fetch transactions');
   return response.json();
 }
 
-export async function fetchBookings(token: string) {
-  const response = await fetch(`${API_BASE_URL}/api/admin/bookings`, {
+export async function fetchBookings(token: string, cursor?: string) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE_URL}/api/admin/bookings${query}`, {
     headers: { Authorization: `Bearer ${token}` },
   });
   if (!response.ok) throw new Error('Failed to fetch bookings');
   return response.json();
 }
 
+export async function fetchAdminStats(token: string) {
+  const response = await fetch(`${API_BASE_URL}/api/admin/stats`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error('Failed to fetch stats');
+  return response.json();
+}
+
+export async function searchAdmin(
+  token: string,
+  collection: 'bookings' | 'messages',
+  params: { q?: string; status?: string; skip?: number; limit?: number } = {}
+) {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') query.set(key, String(value));
+  });
+  const response = await fetch(`${API_BASE_URL}/api/admin/search/${collection}?${query}`, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error(`Failed to search ${collection}`);
+  return response.json();
+}
+
 export async function uploadMedia(file: File, token: string) {
   const formData = new FormData();
   formData.append('file', file);
@@ -156,6 +197,103 @@ export async function uploadMedia(file: File, token: string) {
   return response.json();
 }
 
+export async function uploadMediaBulk(
+  files: File[],
+  token: string,
+  category = 'render'
+) {
+  const formData = new FormData();
+  files.forEach((file) => formData.append('files', file));
+
+  const response = await fetch(
+    `${API_BASE_URL}/api/admin/upload-media/bulk?category=${encodeURIComponent(category)}`,
+    {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${token}` },
+      body: formData,
+    }
+  );
+  if (!response.ok) throw new Error('Failed to upload media');
+  return response.json();
+}
+
+export async function deleteGalleryItems(ids: string[], token: string) {
+  const response = await fetch(`${API_BASE_URL}/api/admin/gallery/delete`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Authorization: `Bearer ${token}`,
+    },
+    body: JSON.stringify({ ids }),
+  });
+  if (!response.ok) throw new Error('Failed to delete gallery items');
+  return response.json();
+}
+
+// Cloudinary accepts larger files only as chunked uploads
+const DIRECT_UPLOAD_CHUNK_SIZE = 20 * 1024 * 1024;
+
+export async function uploadMediaDirect(
+  file: File,
+  token: string,
+  options: { title?: string; category?: string } = {}
+) {
+  const resourceType = file.type.startsWith('image') ? 'image' : 'video';
+
+  const signResponse = await fetch(
+    `${API_BASE_URL}/api/admin/upload-media/sign?resource_type=${resourceType}`,
+    { method: 'POST', headers: { Authorization: `Bearer ${token}` } }
+  );
+  if (!signResponse.ok) throw new Error('Failed to sign upload');
+  const signed = await signResponse.json();
+
+  // The file goes straight to Cloudinary, never through the API server
+  const uploadId = `${signed.timestamp}-${Math.random().toString(36).slice(2)}`;
+  let result: any;
+  for (let start = 0; start < file.size || start === 0; start += DIRECT_UPLOAD_CHUNK_SIZE) {
+    const end = Math.min(start + DIRECT_UPLOAD_CHUNK_SIZE, file.size);
+    const formData = new FormData();
+    formData.append('file', file.slice(start, end));
+    formData.append('api_key', signed.api_key);
+    formData.append('folder', signed.folder);
+    formData.append('timestamp', String(signed.timestamp));
+    formData.append('signature', signed.signature);
+
+    const chunkResponse = await fetch(signed.upload_url, {
+      method: 'POST',
+      headers: {
+        'X-Unique-Upload-Id': uploadId,
+        'Content-Range': `bytes ${start}-${Math.max(end - 1, 0)}/${file.size}`,
+      },
+      body: formData,
+    });
+    if (!chunkResponse.ok) throw new Error('Failed to upload media');
+    result = await chunkResponse.json();
+    if (end >= file.size) break;
+  }
+
+  const completeResponse = await fetch(`${API_BASE_URL}/api/admin/upload-media/complete`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Authorization: `Bearer ${token}`,
+    },
+    body: JSON.stringify({
+      public_id: result.public_id,
+      version: result.version,
+      signature: result.signature,
+      format: result.format,
+      resource_type: result.resource_type,
+      width: result.width,
+      height: result.height,
+      title: options.title || file.name,
+      category: options.category || 'render',
+    }),
+  });
+  if (!completeResponse.ok) throw new Error('Failed to record upload');
+  return completeResponse.json();
+}
+
 export async function submitApplication(applicationData: any) {
   const response = await fetch(`${API_BASE_URL}/api/applications`, {
     method: 'POST',
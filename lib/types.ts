@@ -1,6 +1,14 @@
 /** @format */
 
-export interface Space {
+// Precomputed by the API for uploaded images; absent on external images
+export interface ResponsiveImageFields {
+  width?: number | null;
+  height?: number | null;
+  placeholder?: string | null; // tiny blurred image, usually a data URI
+  srcset?: Partial<Record<'avif' | 'webp' | 'jpg', string>> | null;
+}
+
+export interface Space extends ResponsiveImageFields {
   _id?: string;
   name: string;
   type: 'office' | 'mall' | 'event-hall';
@@ -52,7 +60,7 @@ export interface ContactMessage {
   status: 'new' | 'read' | 'responded';
 }
 
-export interface MediaItem {
+export interface MediaItem extends ResponsiveImageFields {
   _id?: string;
   title: string;
   type: 'image' | 'video';
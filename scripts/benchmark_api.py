@@ -0,0 +1,611 @@
+"""
+API benchmark harness
+Runs every endpoint in backend/main.py against a seeded database with fake
+Paystack, SMTP and Cloudinary backends, and writes throughput and latency
+percentiles per route as JSON so runs can be compared.
+
+    python scripts/benchmark_api.py --bookings 100000 --output bench.json
+    python scripts/benchmark_api.py --bookings 100000 --baseline bench.json
+
+By default it uses the MongoDB at MONGODB_URL and a throwaway database
+(fombina_tower_bench); pass --in-memory to use mongomock-motor instead.
+Requests are sent in-process through the ASGI app, so no API server is needed.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_SECRET_KEY = "sk_test_benchmark"
+ADMIN_EMAIL = "bench-admin@fombinatower.com"
+ADMIN_PASSWORD = "Bench@123"
+# Gallery items removed per gallery/delete request
+GALLERY_DELETE_SIZE = 10
+# The benchmark drops its database, so only names with this suffix are used by default
+BENCH_DATABASE_SUFFIX = "_bench"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark every Fombina Tower API route")
+    parser.add_argument("--bookings", type=int, default=10000, help="Bookings to seed")
+    parser.add_argument("--spaces", type=int, default=1000, help="Spaces to seed")
+    parser.add_argument("--messages", type=int, default=5000, help="Contact messages to seed")
+    parser.add_argument("--gallery", type=int, default=500, help="Gallery items to seed")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients per route")
+    parser.add_argument("--routes", help="Comma-separated route names to run (default: all)")
+    parser.add_argument("--cloudinary-latency", type=float, default=0.05, help="Fake Cloudinary call latency (s)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--mongodb-url", default=os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--database", default="fombina_tower_bench", help="Database to (re)create; it is dropped before and after the run")
+    parser.add_argument("--allow-drop", action="store_true", help=f"Allow dropping a --database whose name does not end in {BENCH_DATABASE_SUFFIX}")
+    parser.add_argument("--in-memory", action="store_true", help="Use mongomock-motor instead of mongod")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write JSON results")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+    if not (args.in_memory or args.allow_drop or args.database.endswith(BENCH_DATABASE_SUFFIX)):
+        parser.error(
+            f"refusing to drop database '{args.database}' on {args.mongodb_url}; "
+            f"use a name ending in {BENCH_DATABASE_SUFFIX} or pass --allow-drop"
+        )
+    return args
+
+
+def configure_environment(args, smtp_port: int):
+    """Point the backend at the benchmark database and fake services before it is imported"""
+    os.environ.update({
+        "MONGODB_URL": args.mongodb_url,
+        "DATABASE_NAME": args.database,
+        "PAYSTACK_SECRET_KEY": BENCH_SECRET_KEY,
+        "PAYSTACK_BASE_URL": "http://fake-paystack",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_STARTTLS": "false",
+        "SMTP_TIMEOUT": "5",
+        "SMTP_USER": "",
+        "FROM_EMAIL": "bench@fombinatower.com",
+        "CLOUDINARY_CLOUD_NAME": "bench",
+        "CLOUDINARY_API_KEY": "bench",
+        "CLOUDINARY_API_SECRET": "benchmark-secret",
+        "JWT_SECRET": "benchmark-secret",
+        "LOGIN_MAX_ATTEMPTS_PER_IP": "1000000",
+    })
+
+
+class FakeSMTPServer:
+    """Minimal SMTP server that accepts and discards every message"""
+
+    def __init__(self):
+        self.server = None
+        self.port = None
+        self.messages = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        writer.write(b"220 fake-smtp ESMTP\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").strip().upper()
+                if command.startswith(("EHLO", "HELO")):
+                    writer.write(b"250 fake-smtp\r\n")
+                elif command.startswith("DATA"):
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    self.messages += 1
+                    writer.write(b"250 OK queued\r\n")
+                elif command.startswith("QUIT"):
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def install_fake_cloudinary(latency: float):
+    """Replace the Cloudinary SDK calls with fakes that sleep for `latency` seconds"""
+    import cloudinary.api
+    import cloudinary.uploader
+    from backend.services import cloudinary_service
+
+    def fake_upload(file, **options):
+        data = file.read() if hasattr(file, "read") else file
+        time.sleep(latency)
+        public_id = options.get("public_id") or f"{options.get('folder', 'bench')}/{hashlib.sha1(data).hexdigest()[:20]}"
+        return {
+            "secure_url": f"https://res.cloudinary.com/bench/image/upload/{public_id}.jpg",
+            "public_id": public_id,
+            "width": 1920,
+            "height": 1080,
+        }
+
+    def fake_destroy(public_id, **options):
+        time.sleep(latency)
+        return {"result": "ok"}
+
+    def fake_delete_resources(public_ids, **options):
+        time.sleep(latency)
+        return {"deleted": {public_id: "deleted" for public_id in public_ids}}
+
+    async def fake_fetch_placeholder(public_id):
+        await asyncio.sleep(latency)
+        return "data:image/jpeg;base64,"
+
+    cloudinary.uploader.upload = fake_upload
+    cloudinary.uploader.upload_large = fake_upload
+    cloudinary.uploader.destroy = fake_destroy
+    cloudinary.api.delete_resources = fake_delete_resources
+    cloudinary_service.fetch_placeholder = fake_fetch_placeholder
+
+
+async def seed(db, args):
+    """
+    Seed the benchmark database with generated data
+
+    Returns:
+        dict: IDs and references the request factories draw from
+    """
+    import bcrypt
+    from scripts.generate_data import generate
+
+    now = datetime.utcnow()
+    await generate(db, args.spaces, args.bookings, args.messages, args.gallery, seed=args.seed)
+
+    await db.timeline.insert_many([
+        {
+            "title": f"Milestone {i}",
+            "description": "Construction milestone",
+            "date": datetime(2024, 1, 1) + timedelta(days=30 * i),
+            "status": "completed" if i < 10 else "upcoming",
+            "created_at": now,
+        }
+        for i in range(20)
+    ])
+
+    await db.admins.insert_one({
+        "email": ADMIN_EMAIL,
+        "password": bcrypt.hashpw(ADMIN_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8"),
+        "name": "Benchmark Admin",
+        "role": "admin",
+        "created_at": now,
+    })
+
+    async def ids(collection, query, field="_id", limit=0):
+        cursor = collection.find(query, {field: 1}).sort("created_at", -1).limit(limit)
+        return [str(doc[field]) async for doc in cursor]
+
+    # Newest first, so pending bookings do not reach their TTL during the run
+    return {
+        "space_ids": await ids(db.spaces, {}),
+        "available_space_ids": await ids(db.spaces, {"available": True}),
+        "pending_references": [f"FT-{booking_id}" for booking_id in await ids(db.bookings, {"payment_status": "pending"}, limit=args.requests)],
+        "confirmed_references": await ids(db.transactions, {}, field="reference", limit=args.requests),
+        "gallery_ids": await ids(db.gallery, {}),
+    }
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+async def run_route(client, make_request, requests: int, concurrency: int, ok_statuses):
+    """Send `requests` requests from `concurrency` workers and summarize the latencies"""
+    latencies = []
+    statuses = Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for i in remaining:
+            request = make_request(i)
+            start = time.perf_counter()
+            response = await client.request(**request)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if status not in ok_statuses)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def sign_webhook(reference: str, amount: int):
+    body = json.dumps({
+        "event": "charge.success",
+        "data": {"reference": reference, "amount": amount, "status": "success", "paid_at": datetime.utcnow().isoformat()},
+    }).encode("utf-8")
+    signature = hmac.new(BENCH_SECRET_KEY.encode("utf-8"), body, hashlib.sha512).hexdigest()
+    return body, signature
+
+
+async def build_routes(client, state, args, admin_headers, fake_paystack):
+    """
+    Build the route benchmarks in execution order
+
+    Returns:
+        list: (name, make_request, requests, ok_statuses) tuples
+    """
+    import cloudinary.utils
+
+    rng = random.Random(args.seed)
+    space_ids = state["space_ids"]
+    requests = args.requests
+
+    # Walk the admin lists to a deep page so its cursor can be replayed
+    deep_cursors = {}
+    for collection in ("bookings", "transactions", "contacts"):
+        cursor = None
+        for _ in range(20):
+            params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get(f"/api/admin/{collection}", params=params, headers=admin_headers)).json()
+            if not page.get("next_cursor"):
+                break
+            cursor = page["next_cursor"]
+        deep_cursors[collection] = cursor
+
+    etags = {}
+    for path in ("/api/spaces", "/api/gallery", "/api/timeline", "/api/bundle/home"):
+        etags[path] = (await client.get(path)).headers.get("etag", "")
+
+    # Spaces reserved by the book-space benchmark and paid for before verification
+    available_spaces = list(state["available_space_ids"])
+    rng.shuffle(available_spaces)
+    booked_references = []
+    pending_references = list(state["pending_references"])
+    confirmed_references = state["confirmed_references"] or ["FT-000000000000000000000000"]
+
+    def get(path, **kwargs):
+        return lambda i: {"method": "GET", "url": path, **kwargs}
+
+    def admin_get(path, **params):
+        return lambda i: {"method": "GET", "url": path, "params": params, "headers": admin_headers}
+
+    def book_space(i):
+        return {
+            "method": "POST",
+            "url": "/api/book-space",
+            "json": {
+                "spaceId": available_spaces[i % len(available_spaces)],
+                "userName": f"Bench Buyer {i}",
+                "userEmail": f"buyer{i}@example.com",
+                "userPhone": "+2348000000000",
+            },
+        }
+
+    def verify_first(i):
+        return {"method": "GET", "url": f"/api/verify-payment/{booked_references[i % len(booked_references)]}"}
+
+    def verify_cached(i):
+        return {"method": "GET", "url": f"/api/verify-payment/{confirmed_references[i % len(confirmed_references)]}"}
+
+    def webhook(i):
+        reference = pending_references[i % len(pending_references)] if pending_references else "FT-000000000000000000000000"
+        body, signature = sign_webhook(reference, 500000)
+        return {
+            "method": "POST",
+            "url": "/api/paystack/webhook",
+            "content": body,
+            "headers": {"Content-Type": "application/json", "x-paystack-signature": signature},
+        }
+
+    def upload(i):
+        return {
+            "method": "POST",
+            "url": "/api/admin/upload-media",
+            "params": {"title": f"Bench upload {i}", "category": "construction"},
+            "files": {"file": (f"bench-{i}.jpg", os.urandom(64 * 1024), "image/jpeg")},
+            "headers": admin_headers,
+        }
+
+    # The same bytes every time, so all but the first request are deduplicated
+    duplicate_file = os.urandom(64 * 1024)
+
+    def upload_duplicate(i):
+        return {
+            "method": "POST",
+            "url": "/api/admin/upload-media",
+            "files": {"file": (f"duplicate-{i}.jpg", duplicate_file, "image/jpeg")},
+            "headers": admin_headers,
+        }
+
+    def upload_bulk(i):
+        return {
+            "method": "POST",
+            "url": "/api/admin/upload-media/bulk",
+            "params": {"category": "construction"},
+            "files": [("files", (f"bulk-{i}-{n}.jpg", os.urandom(64 * 1024), "image/jpeg")) for n in range(10)],
+            "headers": admin_headers,
+        }
+
+    def sign_direct_upload(i):
+        return {
+            "method": "POST",
+            "url": "/api/admin/upload-media/sign",
+            "params": {"resource_type": "video" if i % 2 else "image"},
+            "headers": admin_headers,
+        }
+
+    def complete_direct_upload(i):
+        # Sign the result the way Cloudinary does, so the endpoint's check passes
+        public_id, version = f"fombina-tower/direct-{i}", 1700000000 + i
+        signature = cloudinary.utils.api_sign_request({"public_id": public_id, "version": version}, cloudinary.config().api_secret)
+        return {
+            "method": "POST",
+            "url": "/api/admin/upload-media/complete",
+            "json": {"public_id": public_id, "version": version, "signature": signature, "format": "jpg", "width": 1920, "height": 1080},
+            "headers": admin_headers,
+        }
+
+    # Seeded gallery items, GALLERY_DELETE_SIZE per request, each deleted once
+    gallery_ids = state["gallery_ids"]
+
+    def delete_gallery(i):
+        return {
+            "method": "POST",
+            "url": "/api/admin/gallery/delete",
+            "json": {"ids": gallery_ids[i * GALLERY_DELETE_SIZE:(i + 1) * GALLERY_DELETE_SIZE]},
+            "headers": admin_headers,
+        }
+
+    space_body = {
+        "name": "Benchmark Suite",
+        "type": "office",
+        "floor": 10,
+        "size": 200,
+        "price": 3000000,
+        "features": ["City view"],
+        "available": True,
+        "imageUrl": "/placeholder.jpg",
+        "description": "Created by the benchmark",
+    }
+
+    def create_space(i):
+        return {"method": "POST", "url": "/api/spaces", "json": space_body, "headers": admin_headers}
+
+    def update_space(i):
+        return {
+            "method": "PUT",
+            "url": f"/api/spaces/{space_ids[-1 - (i % len(space_ids))]}",
+            "json": space_body,
+            "headers": admin_headers,
+        }
+
+    def contact(i):
+        return {
+            "method": "POST",
+            "url": "/api/contact",
+            "json": {"name": f"Visitor {i}", "email": f"visitor{i}@example.com", "phone": "+2349000000000", "message": "Viewing request"},
+        }
+
+    def login(i):
+        return {"method": "POST", "url": "/api/admin/login", "json": {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}}
+
+    async def prepare_verification():
+        # Pay for the bookings created by the book-space benchmark without webhooks,
+        # so verify-payment has to take the Paystack round trip
+        for reference in list(fake_paystack.transactions):
+            await fake_paystack.complete_payment(reference, deliver_webhook=False)
+            booked_references.append(reference)
+
+    ok = {200}
+    return [
+        ("root", get("/"), requests, ok, None),
+        ("spaces.list", get("/api/spaces"), requests, ok, None),
+        ("spaces.list.304", get("/api/spaces", headers={"If-None-Match": etags["/api/spaces"]}), requests, {304}, None),
+        ("spaces.list.filtered", lambda i: {"method": "GET", "url": "/api/spaces", "params": {"type": "office", "available": "true", "min_price": 1000000, "max_price": 10000000, "sort": "-price", "skip": i % 50}}, requests, ok, None),
+        ("spaces.search", lambda i: {"method": "GET", "url": "/api/spaces", "params": {"q": "corner city", "skip": i % 50}}, requests, ok, None),
+        ("spaces.get", lambda i: {"method": "GET", "url": f"/api/spaces/{space_ids[i % len(space_ids)]}"}, requests, ok, None),
+        ("gallery.list", get("/api/gallery"), requests, ok, None),
+        ("gallery.list.304", get("/api/gallery", headers={"If-None-Match": etags["/api/gallery"]}), requests, {304}, None),
+        ("timeline.list", get("/api/timeline"), requests, ok, None),
+        ("timeline.list.304", get("/api/timeline", headers={"If-None-Match": etags["/api/timeline"]}), requests, {304}, None),
+        ("bundle.home", get("/api/bundle/home"), requests, ok, None),
+        ("bundle.home.304", get("/api/bundle/home", headers={"If-None-Match": etags["/api/bundle/home"]}), requests, {304}, None),
+        ("admin.bookings.first_page", admin_get("/api/admin/bookings", limit=50), requests, ok, None),
+        ("admin.bookings.deep_page", admin_get("/api/admin/bookings", limit=50, **({"cursor": deep_cursors["bookings"]} if deep_cursors["bookings"] else {})), requests, ok, None),
+        ("admin.transactions.first_page", admin_get("/api/admin/transactions", limit=50), requests, ok, None),
+        ("admin.transactions.deep_page", admin_get("/api/admin/transactions", limit=50, **({"cursor": deep_cursors["transactions"]} if deep_cursors["transactions"] else {})), requests, ok, None),
+        ("admin.contacts.first_page", admin_get("/api/admin/contacts", limit=50), requests, ok, None),
+        ("admin.contacts.deep_page", admin_get("/api/admin/contacts", limit=50, **({"cursor": deep_cursors["contacts"]} if deep_cursors["contacts"] else {})), requests, ok, None),
+        ("admin.stats", admin_get("/api/admin/stats"), requests, ok, None),
+        ("admin.export.bookings.csv", admin_get("/api/admin/export/bookings", format="csv"), max(1, requests // 20), ok, None),
+        ("admin.export.transactions.ndjson.gzip", admin_get("/api/admin/export/transactions", format="ndjson", gzip="true"), max(1, requests // 20), ok, None),
+        ("admin.search.bookings.reference", lambda i: {"method": "GET", "url": "/api/admin/search/bookings", "params": {"q": (pending_references or confirmed_references)[i % len(pending_references or confirmed_references)]}, "headers": admin_headers}, requests, ok, None),
+        ("admin.search.bookings.text", admin_get("/api/admin/search/bookings", q="john", limit=20), requests, ok, None),
+        ("admin.search.messages.status", admin_get("/api/admin/search/messages", status="new", limit=20), requests, ok, None),
+        ("admin.outbox", admin_get("/api/admin/outbox"), requests, ok, None),
+        ("admin.login", login, min(requests, 50), ok, None),
+        ("contact.submit", contact, requests, ok, None),
+        ("spaces.create", create_space, requests, ok, None),
+        ("spaces.update", update_space, requests, ok, None),
+        ("booking.create", book_space, min(requests, len(available_spaces)), ok, None),
+        ("payment.verify.first", verify_first, requests, ok, prepare_verification),
+        ("payment.verify.cached", verify_cached, requests, ok, None),
+        ("payment.webhook", webhook, min(requests, max(len(pending_references), 1)), ok, None),
+        ("media.upload", upload, requests, ok, None),
+        ("media.upload.duplicate", upload_duplicate, requests, ok, None),
+        ("media.upload.bulk10", upload_bulk, max(1, requests // 10), ok, None),
+        ("media.upload.sign", sign_direct_upload, requests, ok, None),
+        ("media.upload.complete", complete_direct_upload, requests, ok, None),
+        ("gallery.delete10", delete_gallery, max(1, min(requests, len(gallery_ids) // GALLERY_DELETE_SIZE)), ok, None),
+        ("metrics", get("/metrics"), requests, ok, None),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results: dict, baseline: dict):
+    """Print p95 latency and throughput changes against a previous run"""
+    print(f"\n{'route':<32} {'p95 ms':>10} {'was':>10} {'change':>8} {'rps':>10} {'was':>10}")
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        p95, old_p95 = result["latency_ms"]["p95"], previous["latency_ms"]["p95"]
+        change = f"{(p95 - old_p95) / old_p95 * 100:+.0f}%" if old_p95 else "n/a"
+        print(f"{name:<32} {p95:>10.2f} {old_p95:>10.2f} {change:>8} {result['throughput_rps']:>10.1f} {previous['throughput_rps']:>10.1f}")
+
+
+async def main():
+    args = parse_args()
+
+    smtp_server = FakeSMTPServer()
+    await smtp_server.start()
+    configure_environment(args, smtp_server.port)
+
+    import httpx
+    import backend.database as database_module
+    from backend import main as api
+    from backend.outbox import start_outbox_worker, stop_outbox_worker
+    from backend.stats import rebuild_stats
+    from backend.services import paystack_service
+    from scripts import fake_paystack
+    from scripts.init_database import create_indexes
+
+    fake_paystack.PAYSTACK_SECRET_KEY = BENCH_SECRET_KEY
+    install_fake_cloudinary(args.cloudinary_latency)
+    paystack_service.client = httpx.AsyncClient(
+        base_url="http://fake-paystack",
+        headers={"Authorization": f"Bearer {BENCH_SECRET_KEY}"},
+        transport=httpx.ASGITransport(app=fake_paystack.app),
+    )
+
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            print("❌ --in-memory needs mongomock-motor: pip install mongomock-motor")
+            return
+        database_module.client = AsyncMongoMockClient()
+        database_module.database = database_module.client[args.database]
+    else:
+        await database_module.connect_to_mongo()
+        await database_module.client.drop_database(args.database)
+
+    try:
+        print(f"🚀 Seeding {args.bookings} bookings, {args.spaces} spaces, {args.messages} messages...")
+        seed_start = time.perf_counter()
+        state = await seed(database_module.database, args)
+        try:
+            await create_indexes()
+        except NotImplementedError as e:
+            print(f"⚠️  Skipping unsupported index in memory mode: {e}")
+        await rebuild_stats()
+        print(f"✅ Seeded in {time.perf_counter() - seed_start:.1f}s")
+
+        await start_outbox_worker()
+        token = api.create_jwt_token({"email": ADMIN_EMAIL, "role": "admin"})
+        admin_headers = {"Authorization": f"Bearer {token}"}
+
+        # Count unhandled errors as 500s instead of aborting the run
+        transport = httpx.ASGITransport(app=api.app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            routes = await build_routes(client, state, args, admin_headers, fake_paystack)
+            selected = set(args.routes.split(",")) if args.routes else None
+            # mongomock has no $text support
+            skipped = {"spaces.search", "admin.search.bookings.text"} if args.in_memory else set()
+
+            results = {}
+            for name, make_request, requests, ok_statuses, prepare in routes:
+                if (selected and name not in selected) or name in skipped:
+                    continue
+                if prepare:
+                    await prepare()
+                if requests <= 0:
+                    continue
+                result = await run_route(client, make_request, requests, args.concurrency, ok_statuses)
+                results[name] = result
+                latency = result["latency_ms"]
+                print(
+                    f"{name:<32} {result['throughput_rps']:>9.1f} rps  "
+                    f"p50 {latency['p50']:>8.2f}  p95 {latency['p95']:>8.2f}  p99 {latency['p99']:>8.2f} ms"
+                    + (f"  errors {result['errors']}" if result["errors"] else "")
+                )
+
+        report = {
+            "meta": {
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "database": "mongomock" if args.in_memory else args.mongodb_url,
+                "scale": {"bookings": args.bookings, "spaces": args.spaces, "messages": args.messages, "gallery": args.gallery},
+                "requests_per_route": args.requests,
+                "concurrency": args.concurrency,
+                "cloudinary_latency_s": args.cloudinary_latency,
+                "emails_delivered": smtp_server.messages,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+        if args.baseline:
+            with open(args.baseline) as f:
+                print_comparison(results, json.load(f))
+
+    finally:
+        await stop_outbox_worker()
+        await paystack_service.close_paystack_client()
+        if not args.in_memory:
+            await database_module.client.drop_database(args.database)
+            await database_module.close_mongo_connection()
+        await smtp_server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
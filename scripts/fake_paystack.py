@@ -0,0 +1,125 @@
+"""
+Local stand-in for the Paystack API
+Run this to exercise the booking, verification and webhook flow offline:
+
+    python scripts/fake_paystack.py
+
+then start the backend with PAYSTACK_BASE_URL=http://localhost:8001 and the
+same PAYSTACK_SECRET_KEY. Opening a payment's authorization_url marks it paid,
+delivers a signed charge.success webhook to PAYSTACK_WEBHOOK_URL and redirects
+to the booking's callback_url, just like the hosted checkout.
+"""
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import RedirectResponse
+
+FAKE_PAYSTACK_HOST = os.getenv("FAKE_PAYSTACK_HOST", "127.0.0.1")
+FAKE_PAYSTACK_PORT = int(os.getenv("FAKE_PAYSTACK_PORT", "8001"))
+FAKE_PAYSTACK_URL = os.getenv("FAKE_PAYSTACK_URL", f"http://localhost:{FAKE_PAYSTACK_PORT}")
+PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY", "sk_test_fake")
+PAYSTACK_WEBHOOK_URL = os.getenv("PAYSTACK_WEBHOOK_URL", "http://localhost:8000/api/paystack/webhook")
+
+app = FastAPI(title="Fake Paystack")
+
+# In-memory transactions keyed by reference
+transactions = {}
+
+
+def check_auth(request: Request):
+    """Reject requests that do not carry the configured secret key"""
+    if request.headers.get("authorization") != f"Bearer {PAYSTACK_SECRET_KEY}":
+        raise HTTPException(status_code=401, detail={"status": False, "message": "Invalid key"})
+
+
+def sign(body: bytes) -> str:
+    """Sign a webhook body the way Paystack does"""
+    return hmac.new(PAYSTACK_SECRET_KEY.encode("utf-8"), body, hashlib.sha512).hexdigest()
+
+
+def charge_data(transaction: dict):
+    """Transaction payload in the shape Paystack returns it"""
+    return {
+        "reference": transaction["reference"],
+        "amount": transaction["amount"],
+        "status": transaction["status"],
+        "paid_at": transaction.get("paid_at"),
+        "customer": {"email": transaction["email"]},
+        "metadata": transaction.get("metadata"),
+    }
+
+
+@app.post("/transaction/initialize")
+async def initialize(request: Request):
+    check_auth(request)
+    payload = await request.json()
+    reference = payload.get("reference") or secrets.token_hex(8)
+    transactions[reference] = {
+        "reference": reference,
+        "email": payload["email"],
+        "amount": payload["amount"],
+        "metadata": payload.get("metadata"),
+        "callback_url": payload.get("callback_url"),
+        "status": "abandoned",
+    }
+    return {
+        "status": True,
+        "message": "Authorization URL created",
+        "data": {
+            "authorization_url": f"{FAKE_PAYSTACK_URL}/pay/{reference}",
+            "access_code": secrets.token_hex(8),
+            "reference": reference,
+        },
+    }
+
+
+@app.get("/transaction/verify/{reference}")
+async def verify(reference: str, request: Request):
+    check_auth(request)
+    transaction = transactions.get(reference)
+    if transaction is None:
+        return {"status": False, "message": "Transaction reference not found"}
+    return {"status": True, "message": "Verification successful", "data": charge_data(transaction)}
+
+
+async def complete_payment(reference: str, deliver_webhook: bool = True):
+    """Mark a transaction paid and optionally deliver its charge.success webhook"""
+    transaction = transactions.get(reference)
+    if transaction is None:
+        raise HTTPException(status_code=404, detail="Transaction reference not found")
+
+    transaction["status"] = "success"
+    transaction["paid_at"] = datetime.utcnow().isoformat() + "Z"
+
+    if deliver_webhook:
+        body = json.dumps({"event": "charge.success", "data": charge_data(transaction)}).encode("utf-8")
+        async with httpx.AsyncClient(timeout=10) as client:
+            await client.post(
+                PAYSTACK_WEBHOOK_URL,
+                content=body,
+                headers={"Content-Type": "application/json", "x-paystack-signature": sign(body)},
+            )
+    return transaction
+
+
+@app.get("/pay/{reference}")
+async def pay(reference: str, webhook: bool = True):
+    """Hosted checkout stand-in: pay immediately and redirect back to the site"""
+    transaction = await complete_payment(reference, deliver_webhook=webhook)
+    callback_url = transaction.get("callback_url")
+    if callback_url:
+        separator = "&" if "?" in callback_url else "?"
+        return RedirectResponse(f"{callback_url}{separator}reference={reference}")
+    return {"status": True, "reference": reference}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=FAKE_PAYSTACK_HOST, port=FAKE_PAYSTACK_PORT)
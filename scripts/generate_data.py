@@ -0,0 +1,453 @@
+"""
+Synthetic data generator
+Fills a database with realistic spaces, bookings, transactions, contact
+messages and gallery items at any scale, reproducibly from a random seed.
+
+    python scripts/generate_data.py --spaces 5000 --bookings 2000000 --messages 200000 --drop
+    python scripts/generate_data.py --bookings 100000 --space-types office=5,mall=3,event-hall=2
+
+Documents are produced by generators and written in unordered insert_many
+batches with a bounded number of batches in flight, so memory use does not
+grow with the row count. Indexes are built after loading, which is faster
+than maintaining them during the insert.
+"""
+import argparse
+import asyncio
+import calendar
+import random
+import sys
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict
+
+from bson import ObjectId
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.bookings import PENDING_BOOKING_TTL_HOURS
+from backend.database import connect_to_mongo, close_mongo_connection, get_database
+from backend.stats import rebuild_stats
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+SPACE_TYPES = {
+    "office": {
+        "names": ["Executive Office Suite", "Corporate Office Floor", "Open Plan Office", "Corner Office", "Startup Studio"],
+        "floors": (5, 40),
+        "size": (40, 1200),
+        "price_per_sqm": (25000, 45000),
+        "features": ["Floor-to-ceiling windows", "Private bathroom", "Kitchenette", "Conference room access",
+                     "Premium finishes", "Smart climate control", "Reception area", "City view", "Server room"],
+    },
+    "mall": {
+        "names": ["Premium Retail Space", "Boutique Unit", "Flagship Store", "Food Court Kiosk", "Anchor Store"],
+        "floors": (1, 4),
+        "size": (20, 900),
+        "price_per_sqm": (30000, 60000),
+        "features": ["High foot traffic location", "Large display windows", "Storage area", "Loading dock access",
+                     "Modern lighting", "Security system", "Corner unit", "Escalator frontage"],
+    },
+    "event-hall": {
+        "names": ["Grand Event Hall", "Banquet Hall", "Conference Centre", "Rooftop Terrace", "Exhibition Space"],
+        "floors": (1, 45),
+        "size": (150, 2500),
+        "price_per_sqm": (8000, 20000),
+        "features": ["Stage and AV equipment", "Catering kitchen", "Bridal suite", "Valet parking",
+                     "Sound system", "Rooftop access", "Projector screens", "Breakout rooms"],
+    },
+}
+
+FIRST_NAMES = ["Amina", "Chinedu", "Fatima", "Ibrahim", "Ngozi", "Oluwaseun", "Musa", "Aisha", "Emeka", "Zainab",
+               "Tunde", "Halima", "Obinna", "Hauwa", "Yusuf", "Adaeze", "Bello", "Funmilayo", "Kelechi", "Maryam"]
+LAST_NAMES = ["Abubakar", "Okafor", "Adeyemi", "Bello", "Eze", "Mohammed", "Okonkwo", "Lawal", "Nwosu", "Danjuma",
+              "Balogun", "Usman", "Obi", "Suleiman", "Adebayo", "Yakubu", "Chukwu", "Garba", "Ogunleye", "Ibekwe"]
+COMPANY_SUFFIXES = ["Holdings", "Ventures", "Limited", "Group", "Partners", "Technologies", "Logistics", "Consulting"]
+MESSAGE_TEMPLATES = [
+    "I would like to schedule a viewing of the available {type} spaces.",
+    "Please send me the price list and payment plan for {type} units.",
+    "Is the {type} space on floor {floor} still available?",
+    "We are looking for about {size} sqm for our company. What options do you have?",
+    "Can I get more information about the completion date and handover?",
+]
+GALLERY_CATEGORIES = {"render": 4, "construction": 5, "interior": 3, "exterior": 2, "event": 1}
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """Parse a distribution like "office=6,mall=3,event-hall=1" """
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if not name.strip() or not weight:
+            raise argparse.ArgumentTypeError(f"Expected name=weight pairs, got {value!r}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+@dataclass
+class DataProfile:
+    """Relative distributions for the generated data"""
+
+    space_type_weights: Dict[str, float] = field(default_factory=lambda: {"office": 6, "mall": 3, "event-hall": 1})
+    # Share of spaces still on sale
+    available_ratio: float = 0.7
+    # Share of bookings still awaiting payment (always created within the pending TTL)
+    pending_ratio: float = 0.05
+    # Share of bookings made on behalf of a company
+    company_ratio: float = 0.6
+    message_status_weights: Dict[str, float] = field(default_factory=lambda: {"new": 2, "read": 5, "responded": 3})
+    gallery_category_weights: Dict[str, float] = field(default_factory=lambda: dict(GALLERY_CATEGORIES))
+    gallery_video_ratio: float = 0.1
+    # How far back created_at values are spread
+    history_days: int = 730
+
+
+def object_id_at(rng: random.Random, when: datetime) -> ObjectId:
+    """Reproducible ObjectId whose embedded timestamp matches the document's created_at"""
+    return ObjectId(calendar.timegm(when.utctimetuple()).to_bytes(4, "big") + rng.randbytes(8))
+
+
+def weighted_choice(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def random_past(rng: random.Random, now: datetime, days: int) -> datetime:
+    return now - timedelta(seconds=rng.randint(0, days * 24 * 3600))
+
+
+def person(rng: random.Random, index: int):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+        "phone": f"+234{rng.choice(['80', '81', '70', '90'])}{rng.randint(0, 99999999):08d}",
+    }
+
+
+class SpaceCatalog:
+    """Per-space facts the booking generator needs, without holding whole documents"""
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.prices = []
+
+    def __len__(self):
+        return len(self.prices)
+
+
+def generate_spaces(count: int, profile: DataProfile, rng: random.Random, now: datetime, catalog: SpaceCatalog):
+    """Yield space documents, recording each space's ID, name and price in the catalog"""
+    for i in range(count):
+        space_type = weighted_choice(rng, profile.space_type_weights)
+        spec = SPACE_TYPES[space_type]
+        size = rng.randint(*spec["size"])
+        price = round(size * rng.randint(*spec["price_per_sqm"]), -4)
+        floor = rng.randint(*spec["floors"])
+        name = f"{rng.choice(spec['names'])} {floor}{chr(65 + i % 26)}-{i + 1}"
+        created_at = random_past(rng, now, profile.history_days)
+        space_id = object_id_at(rng, created_at)
+        catalog.ids.append(space_id)
+        catalog.names.append(name)
+        catalog.prices.append(price)
+        yield {
+            "_id": space_id,
+            "name": name,
+            "type": space_type,
+            "floor": floor,
+            "size": size,
+            "price": price,
+            "features": rng.sample(spec["features"], rng.randint(3, 6)),
+            "available": rng.random() < profile.available_ratio,
+            "imageUrl": "/placeholder.jpg",
+            "description": f"{name}: {size} sqm {space_type.replace('-', ' ')} on floor {floor} of Fombina Tower, Abuja.",
+            "created_at": created_at,
+        }
+
+
+def generate_bookings(count: int, profile: DataProfile, rng: random.Random, now: datetime, catalog: SpaceCatalog):
+    """
+    Yield (booking, transaction) pairs; transaction is None for unpaid bookings
+
+    Unpaid bookings fall inside the pending TTL window, as older ones would
+    already have been removed by the TTL index.
+    """
+    for i in range(count):
+        space_index = rng.randrange(len(catalog))
+        customer = person(rng, i)
+        amount = int(catalog.prices[space_index] * 0.1)
+        pending = rng.random() < profile.pending_ratio
+        if pending:
+            created_at = now - timedelta(seconds=rng.randint(0, PENDING_BOOKING_TTL_HOURS * 3600))
+        else:
+            created_at = random_past(rng, now, profile.history_days)
+        booking_id = object_id_at(rng, created_at)
+
+        booking = {
+            "_id": booking_id,
+            "space_id": str(catalog.ids[space_index]),
+            **customer,
+            "company_name": (
+                f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}"
+                if rng.random() < profile.company_ratio else None
+            ),
+            "amount": amount,
+            "created_at": created_at,
+        }
+        if pending:
+            booking.update({
+                "status": "pending",
+                "payment_status": "pending",
+                "expires_at": created_at + timedelta(hours=PENDING_BOOKING_TTL_HOURS),
+            })
+            yield booking, None
+            continue
+
+        reference = f"FT-{booking_id}"
+        paid_at = created_at + timedelta(seconds=rng.randint(30, 1800))
+        booking.update({
+            "status": "confirmed",
+            "payment_status": "completed",
+            "payment_reference": reference,
+            "updated_at": paid_at,
+        })
+        transaction = {
+            "_id": object_id_at(rng, paid_at),
+            "booking_id": str(booking_id),
+            "reference": reference,
+            "amount": amount,
+            "status": "success",
+            "space_name": catalog.names[space_index],
+            "paystack_data": {
+                "success": True,
+                "amount": amount * 100,
+                "customer": {"email": customer["email"]},
+                "paid_at": paid_at.isoformat() + "Z",
+                "reference": reference,
+            },
+            "created_at": paid_at,
+        }
+        yield booking, transaction
+
+
+def generate_messages(count: int, profile: DataProfile, rng: random.Random, now: datetime):
+    for i in range(count):
+        space_type = weighted_choice(rng, profile.space_type_weights)
+        created_at = random_past(rng, now, profile.history_days)
+        yield {
+            "_id": object_id_at(rng, created_at),
+            **person(rng, i),
+            "message": rng.choice(MESSAGE_TEMPLATES).format(
+                type=space_type.replace("-", " "), floor=rng.randint(1, 45), size=rng.randint(50, 1000)
+            ),
+            "status": weighted_choice(rng, profile.message_status_weights),
+            "created_at": created_at,
+        }
+
+
+def generate_gallery(count: int, profile: DataProfile, rng: random.Random, now: datetime):
+    for i in range(count):
+        category = weighted_choice(rng, profile.gallery_category_weights)
+        media_type = "video" if rng.random() < profile.gallery_video_ratio else "image"
+        public_id = f"fombina-tower/{category}/{i:07d}"
+        created_at = random_past(rng, now, profile.history_days)
+        yield {
+            "_id": object_id_at(rng, created_at),
+            "title": f"{category.capitalize()} {i + 1}",
+            "type": media_type,
+            "url": f"https://res.cloudinary.com/fombina/{media_type}/upload/{public_id}.{'mp4' if media_type == 'video' else 'jpg'}",
+            "public_id": public_id,
+            "category": category,
+            "created_at": created_at,
+        }
+
+
+class BatchWriter:
+    """Buffer documents and write them in unordered batches, with a cap on batches in flight"""
+
+    def __init__(self, collection, batch_size: int = DEFAULT_BATCH_SIZE, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.pending = set()
+        self.batch = []
+        self.written = 0
+
+    async def add(self, document: dict):
+        self.batch.append(document)
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        await self.slots.acquire()
+        task = asyncio.create_task(self._write(batch))
+        self.pending.add(task)
+        # Surface write errors from finished batches instead of waiting for close();
+        # tasks stay in pending until their result has been checked here
+        for done in [task for task in self.pending if task.done()]:
+            self.pending.discard(done)
+            done.result()
+
+    async def _write(self, batch):
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        finally:
+            self.slots.release()
+
+    async def close(self):
+        await self.flush()
+        if self.pending:
+            await asyncio.gather(*self.pending)
+
+
+async def write_all(collection, documents, batch_size: int, max_in_flight: int) -> int:
+    """Stream documents into a collection; returns the number written"""
+    writer = BatchWriter(collection, batch_size, max_in_flight)
+    for document in documents:
+        await writer.add(document)
+    await writer.close()
+    return writer.written
+
+
+async def generate(
+    db,
+    spaces: int,
+    bookings: int,
+    messages: int,
+    gallery: int,
+    profile: DataProfile = None,
+    seed: int = 42,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+):
+    """
+    Generate and insert a synthetic dataset
+
+    Args:
+        db: Database to write into
+        spaces, bookings, messages, gallery: Number of documents of each kind
+        profile: Distributions to draw from (defaults to DataProfile())
+        seed: Random seed; the same seed reproduces the same data
+        batch_size: Documents per insert_many
+        max_in_flight: Concurrent insert_many calls per collection
+
+    Returns:
+        dict: Number of documents written per collection
+    """
+    profile = profile or DataProfile()
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    counts = {}
+
+    catalog = SpaceCatalog()
+    counts["spaces"] = await write_all(
+        db.spaces, generate_spaces(spaces, profile, rng, now, catalog), batch_size, max_in_flight
+    )
+
+    if bookings and len(catalog):
+        booking_writer = BatchWriter(db.bookings, batch_size, max_in_flight)
+        transaction_writer = BatchWriter(db.transactions, batch_size, max_in_flight)
+        for booking, transaction in generate_bookings(bookings, profile, rng, now, catalog):
+            await booking_writer.add(booking)
+            if transaction:
+                await transaction_writer.add(transaction)
+        await booking_writer.close()
+        await transaction_writer.close()
+        counts["bookings"] = booking_writer.written
+        counts["transactions"] = transaction_writer.written
+
+    counts["messages"] = await write_all(
+        db.messages, generate_messages(messages, profile, rng, now), batch_size, max_in_flight
+    )
+    counts["gallery"] = await write_all(
+        db.gallery, generate_gallery(gallery, profile, rng, now), batch_size, max_in_flight
+    )
+    return counts
+
+
+def parse_args():
+    defaults = DataProfile()
+    parser = argparse.ArgumentParser(description="Generate a synthetic Fombina Tower dataset")
+    parser.add_argument("--spaces", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--gallery", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--space-types", type=parse_weights, default=defaults.space_type_weights,
+                        help="Space type weights, e.g. office=6,mall=3,event-hall=1")
+    parser.add_argument("--available-ratio", type=float, default=defaults.available_ratio)
+    parser.add_argument("--pending-ratio", type=float, default=defaults.pending_ratio)
+    parser.add_argument("--company-ratio", type=float, default=defaults.company_ratio)
+    parser.add_argument("--message-statuses", type=parse_weights, default=defaults.message_status_weights,
+                        help="Message status weights, e.g. new=2,read=5,responded=3")
+    parser.add_argument("--gallery-categories", type=parse_weights, default=defaults.gallery_category_weights)
+    parser.add_argument("--gallery-video-ratio", type=float, default=defaults.gallery_video_ratio)
+    parser.add_argument("--history-days", type=int, default=defaults.history_days)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="Concurrent insert_many calls per collection")
+    parser.add_argument("--drop", action="store_true", help="Drop the generated collections first")
+    parser.add_argument("--skip-indexes", action="store_true", help="Do not build indexes after loading")
+    args = parser.parse_args()
+
+    unknown = set(args.space_types) - set(SPACE_TYPES)
+    if unknown:
+        parser.error(f"Unknown space types: {', '.join(sorted(unknown))}")
+    return args
+
+
+async def main():
+    """Generate the dataset described by the command line"""
+    args = parse_args()
+    profile = DataProfile(
+        space_type_weights=args.space_types,
+        available_ratio=args.available_ratio,
+        pending_ratio=args.pending_ratio,
+        company_ratio=args.company_ratio,
+        message_status_weights=args.message_statuses,
+        gallery_category_weights=args.gallery_categories,
+        gallery_video_ratio=args.gallery_video_ratio,
+        history_days=args.history_days,
+    )
+
+    try:
+        await connect_to_mongo()
+        db = get_database()
+
+        if args.drop:
+            for name in ("spaces", "bookings", "transactions", "messages", "gallery", "stats"):
+                await db.drop_collection(name)
+            print("✅ Dropped existing data")
+
+        print("🚀 Generating data...")
+        start = datetime.utcnow()
+        counts = await generate(
+            db, args.spaces, args.bookings, args.messages, args.gallery,
+            profile=profile, seed=args.seed, batch_size=args.batch_size, max_in_flight=args.max_in_flight,
+        )
+        elapsed = (datetime.utcnow() - start).total_seconds()
+        for name, count in counts.items():
+            print(f"✅ {count} {name} added")
+        print(f"✅ {sum(counts.values())} documents in {elapsed:.1f}s")
+
+        if not args.skip_indexes:
+            from scripts.init_database import create_indexes
+            await create_indexes()
+
+        await rebuild_stats()
+        print("✅ Dashboard stats rebuilt")
+
+    except Exception as e:
+        print(f"\n❌ Error generating data: {e}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,9 +9,47 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.auth import hash_password
 from backend.database import connect_to_mongo, close_mongo_connection, get_database
+from backend.stats import rebuild_stats
 from datetime import datetime
-import bcrypt
+
+
+async def dedupe_transactions():
+    """Remove duplicate transactions per reference, keeping the earliest one"""
+    db = get_database()
+    
+    duplicates = await db.transactions.aggregate([
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {"_id": "$reference", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True).to_list(length=None)
+    
+    extra_ids = [doc_id for group in duplicates for doc_id in group["ids"][1:]]
+    if not extra_ids:
+        return
+    
+    result = await db.transactions.delete_many({"_id": {"$in": extra_ids}})
+    print(f"✅ Removed {result.deleted_count} duplicate transactions")
+
+
+async def create_unique_reference_index():
+    """
+    Make transactions.reference unique
+
+    Databases created before references were unique already have a plain
+    index named reference_1, and MongoDB will not change an index's options
+    in place, so it is dropped once the duplicates are gone.
+    """
+    db = get_database()
+    await dedupe_transactions()
+
+    existing = (await db.transactions.index_information()).get("reference_1")
+    if existing and not existing.get("unique"):
+        await db.transactions.drop_index("reference_1")
+        print("✅ Dropped non-unique transactions.reference index")
+
+    await db.transactions.create_index("reference", unique=True)
 
 
 async def create_indexes():
@@ -22,28 +60,68 @@ async def create_indexes():
     await db.spaces.create_index("type")
     await db.spaces.create_index("available")
     await db.spaces.create_index([("name", 1)])
+    await db.spaces.create_index([("type", 1), ("available", 1), ("price", 1)])
+    await db.spaces.create_index([("available", 1), ("price", 1)])
+    await db.spaces.create_index([("type", 1), ("floor", 1)])
+    await db.spaces.create_index([("type", 1), ("size", 1)])
+    await db.spaces.create_index(
+        [("name", "text"), ("description", "text"), ("features", "text")],
+        weights={"name": 10, "features": 5, "description": 1},
+        name="spaces_text",
+    )
     
     # Bookings indexes
     await db.bookings.create_index("space_id")
     await db.bookings.create_index("email")
     await db.bookings.create_index("payment_reference")
-    await db.bookings.create_index([("created_at", -1)])
+    await db.bookings.create_index([("created_at", -1), ("_id", -1)])
+    # Admin search: prefix lookups by phone and status filters, plus full-text search
+    await db.bookings.create_index("phone")
+    await db.bookings.create_index([("status", 1), ("created_at", -1)])
+    # Payment reconciliation walks pending bookings oldest first
+    await db.bookings.create_index([("payment_status", 1), ("created_at", 1), ("_id", 1)])
+    await db.bookings.create_index(
+        [("name", "text"), ("email", "text"), ("company_name", "text"), ("phone", "text")],
+        weights={"name": 10, "email": 8, "company_name": 5, "phone": 2},
+        name="bookings_search",
+    )
+    # Expire unpaid bookings; confirmed bookings have expires_at removed
+    await db.bookings.create_index(
+        "expires_at",
+        expireAfterSeconds=0,
+        partialFilterExpression={"payment_status": "pending"},
+    )
     
     # Transactions indexes
     await db.transactions.create_index("booking_id")
-    await db.transactions.create_index("reference")
-    await db.transactions.create_index([("created_at", -1)])
+    await create_unique_reference_index()
+    await db.transactions.create_index([("created_at", -1), ("_id", -1)])
     
     # Gallery indexes
     await db.gallery.create_index("category")
     await db.gallery.create_index([("created_at", -1)])
+    await db.gallery.create_index("url")
+    await db.gallery.create_index("public_id")
+    # Content hash of uploads; older items without one are not covered
+    await db.gallery.create_index("sha256", unique=True, sparse=True)
     
     # Timeline indexes
     await db.timeline.create_index([("date", 1)])
     
     # Messages indexes
     await db.messages.create_index("email")
-    await db.messages.create_index([("created_at", -1)])
+    await db.messages.create_index([("created_at", -1), ("_id", -1)])
+    await db.messages.create_index("phone")
+    await db.messages.create_index([("status", 1), ("created_at", -1)])
+    await db.messages.create_index(
+        [("name", "text"), ("email", "text"), ("message", "text")],
+        weights={"name": 10, "email": 8, "message": 1},
+        name="messages_search",
+    )
+    
+    # Outbox indexes
+    await db.outbox.create_index([("status", 1), ("next_attempt_at", 1)])
+    await db.outbox.create_index("sent_at", expireAfterSeconds=30 * 24 * 3600)
     
     print("✅ Database indexes created")
 
@@ -60,11 +138,11 @@ async def create_admin_user():
     
     # Create admin user
     password = "Admin@123"  # Change this in production!
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    hashed_password = await hash_password(password)
     
     admin_user = {
         "email": "admin@fombinatower.com",
-        "password": hashed_password.decode('utf-8'),
+        "password": hashed_password,
         "name": "Admin User",
         "role": "admin",
         "created_at": datetime.utcnow(),
@@ -214,6 +292,10 @@ async def main():
         # Seed sample data
         await seed_sample_spaces()
         await seed_timeline()
+
+        # Build dashboard counters from the seeded data
+        await rebuild_stats()
+        print("✅ Dashboard stats built")
         
         print("\n✅ Database initialization completed successfully!")
         print("\n📝 Next steps:")
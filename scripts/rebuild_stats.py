@@ -0,0 +1,35 @@
+"""
+Dashboard stats rebuild script
+Run this to recompute the incrementally maintained stats document from scratch
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import connect_to_mongo, close_mongo_connection
+from backend.stats import rebuild_stats, STAT_FIELDS
+
+
+async def main():
+    """Rebuild the dashboard stats document"""
+    print("🚀 Rebuilding dashboard stats...")
+
+    try:
+        await connect_to_mongo()
+        stats = await rebuild_stats()
+
+        for field in STAT_FIELDS:
+            print(f"   {field}: {stats[field]}")
+        print("\n✅ Dashboard stats rebuilt successfully!")
+
+    except Exception as e:
+        print(f"\n❌ Error rebuilding stats: {e}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Payment reconciliation script
+Rechecks bookings stuck in pending payment against Paystack and records the
+ones that were actually paid (their confirmation emails are queued for the
+API's outbox worker). Safe to interrupt: the next run resumes from the last
+completed batch. Run it from cron, e.g. every 15 minutes:
+
+    python scripts/reconcile_payments.py
+    python scripts/reconcile_payments.py --concurrency 10 --rate-limit 20 --max-bookings 5000
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import connect_to_mongo, close_mongo_connection
+from backend.reconcile import (
+    RECONCILE_MIN_AGE_MINUTES,
+    RECONCILE_BATCH_SIZE,
+    RECONCILE_CONCURRENCY,
+    RECONCILE_RATE_LIMIT,
+    reconcile_payments,
+)
+from backend.services.paystack_service import close_paystack_client
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Reconcile pending bookings with Paystack")
+    parser.add_argument("--min-age", type=int, default=RECONCILE_MIN_AGE_MINUTES,
+                        help="Only check bookings at least this many minutes old")
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=RECONCILE_CONCURRENCY,
+                        help="Maximum Paystack requests in flight")
+    parser.add_argument("--rate-limit", type=float, default=RECONCILE_RATE_LIMIT,
+                        help="Maximum Paystack requests per second")
+    parser.add_argument("--max-bookings", type=int, help="Stop after this many bookings; the next run resumes")
+    parser.add_argument("--restart", action="store_true", help="Discard an unfinished pass and start over")
+    return parser.parse_args()
+
+
+async def main():
+    """Run one reconciliation pass"""
+    args = parse_args()
+    print("🚀 Reconciling pending payments...")
+
+    try:
+        await connect_to_mongo()
+        checkpoint = await reconcile_payments(
+            restart=args.restart,
+            min_age_minutes=args.min_age,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            rate_limit=args.rate_limit,
+            max_bookings=args.max_bookings,
+        )
+
+        counts = checkpoint["counts"]
+        print(f"   checked: {counts['checked']}")
+        print(f"   paid: {counts['paid']}")
+        print(f"   still unpaid: {counts['unpaid']}")
+        print(f"   errors: {counts['errors']}")
+
+        if checkpoint["status"] == "completed":
+            print("\n✅ Reconciliation pass completed")
+        else:
+            print("\n✅ Stopped early; run again to resume from the checkpoint")
+
+    except Exception as e:
+        print(f"\n❌ Error during reconciliation: {e}")
+    finally:
+        await close_paystack_client()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import mongomock_motor
+import pytest
+from bson import ObjectId
+
+import backend.database as database
+import backend.payments as payments
+from backend.bookings import confirm_space_hold, hold_space
+from backend.payments import record_successful_payment, verified_payments
+from backend.stats import STATS_ID, rebuild_stats
+
+COUNTERS = ("total_bookings", "confirmed_bookings", "available_spaces", "total_revenue")
+
+
+@pytest.fixture
+def db():
+    database.client = mongomock_motor.AsyncMongoMockClient()
+    database.database = database.client["fombina_tower_test"]
+    verified_payments._entries.clear()
+    return database.database
+
+
+async def create_pending_booking(db):
+    now = datetime.utcnow()
+    space_id = (await db.spaces.insert_one({"name": "Suite 1", "price": 1000000, "available": True})).inserted_id
+    booking_id = ObjectId()
+    await hold_space(str(space_id), str(booking_id), now)
+    await db.bookings.insert_one({
+        "_id": booking_id,
+        "space_id": str(space_id),
+        "name": "Ada",
+        "email": "ada@example.com",
+        "phone": "08030000000",
+        "status": "pending",
+        "payment_status": "pending",
+        "amount": 100000,
+        "created_at": now,
+        "expires_at": now + timedelta(hours=24),
+    })
+    await rebuild_stats()
+    return f"FT-{booking_id}"
+
+
+async def counters(db):
+    stats = await db.stats.find_one({"_id": STATS_ID})
+    return {field: stats.get(field) for field in COUNTERS}
+
+
+def test_concurrent_confirmations_count_once(db, monkeypatch):
+    """Webhook and verify-payment racing for the same reference move each counter exactly once"""
+    async def slow_confirm_space_hold(*args):
+        # Let the other call overtake the one that confirmed the booking
+        await asyncio.sleep(0.05)
+        return await confirm_space_hold(*args)
+
+    monkeypatch.setattr(payments, "confirm_space_hold", slow_confirm_space_hold)
+
+    async def scenario():
+        reference = await create_pending_booking(db)
+        verification = {"success": True, "reference": reference, "amount": 10000000}
+
+        await asyncio.gather(
+            record_successful_payment(reference, verification),
+            record_successful_payment(reference, verification),
+        )
+        recorded = await counters(db)
+        await record_successful_payment(reference, verification)
+        replayed = await counters(db)
+
+        await rebuild_stats()
+        return recorded, replayed, await counters(db)
+
+    recorded, replayed, rebuilt = asyncio.run(scenario())
+    assert recorded == rebuilt
+    assert replayed == rebuilt
+    assert rebuilt == {"total_bookings": 1, "confirmed_bookings": 1, "available_spaces": 0, "total_revenue": 100000}
+    assert asyncio.run(db.transactions.count_documents({})) == 1
+    assert asyncio.run(db.outbox.count_documents({})) == 1
+
+
+def test_payment_for_missing_booking_is_recorded_for_review(db):
+    """A charge whose booking expired is kept as a transaction instead of failing the webhook"""
+    reference = f"FT-{ObjectId()}"
+    verification = {"success": True, "reference": reference, "amount": 10000000}
+
+    async def scenario():
+        await rebuild_stats()
+        summary = await record_successful_payment(reference, verification)
+        verified_payments._entries.clear()
+        await record_successful_payment(reference, verification)
+        transaction = await db.transactions.find_one({"reference": reference})
+        return summary, transaction, await counters(db)
+
+    summary, transaction, stats = asyncio.run(scenario())
+    assert summary == {"success": True, "reference": reference, "spaceName": None, "amount": 100000}
+    assert transaction["booking_id"] is None
+    assert transaction["needs_review"] is True
+    assert stats["total_revenue"] == 100000
+    assert asyncio.run(db.transactions.count_documents({})) == 1
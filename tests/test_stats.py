@@ -0,0 +1,39 @@
+import asyncio
+
+import mongomock_motor
+import pytest
+
+import backend.database as database
+from backend.stats import STAT_FIELDS, STATS_ID, increment_stats, read_stats
+
+
+@pytest.fixture
+def db():
+    database.client = mongomock_motor.AsyncMongoMockClient()
+    database.database = database.client["fombina_tower_test"]
+    return database.database
+
+
+def test_first_increment_builds_the_full_stats_document(db):
+    """An install without a stats document gets every counter, not just the one incremented"""
+    async def scenario():
+        await db.spaces.insert_many([{"name": "Suite 1", "available": True}, {"name": "Suite 2", "available": False}])
+        await db.transactions.insert_one({"status": "success", "amount": 100000})
+        await db.messages.insert_one({"status": "new"})
+        await increment_stats(unread_messages=1)
+        return await db.stats.find_one({"_id": STATS_ID})
+
+    stats = asyncio.run(scenario())
+    assert all(field in stats for field in STAT_FIELDS)
+    assert (stats["total_spaces"], stats["available_spaces"], stats["total_revenue"], stats["unread_messages"]) == (2, 1, 100000, 1)
+
+
+def test_partial_stats_document_is_rebuilt_on_read(db):
+    async def scenario():
+        await db.spaces.insert_one({"name": "Suite 1", "available": True})
+        await db.stats.insert_one({"_id": STATS_ID, "unread_messages": 1})
+        return await read_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["total_spaces"] == 1
+    assert stats["unread_messages"] == 0